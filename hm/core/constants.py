@@ -4,7 +4,7 @@ import re
 RE_COORDS = re.compile(r"(-?\d{1,2}\.\d+)\s*,\s*(-?\d{1,3}\.\d+)")
 RE_ADDRESS = re.compile(r"^(.+?)\s+(\d+[a-zA-Z]?)\s*,\s*(.+)$")  # "Street 12, City"
 RE_STREET_CITY = re.compile(r"^(.+?)\s*,\s*(.+)$")  # "Street, City"
-RE_CROSS = re.compile(r"^(.+?)\s*(?:/| x | & )\s*(.+?)\s*,\s*(.+)$", re.IGNORECASE)  # "A / B, City"
+RE_CROSS = re.compile(r"^(.+?)\s*(?:/| x | & )\s*(\S.*?)\s*,\s*(.+)$", re.IGNORECASE)  # "A / B, City"
 RE_INTERSECTION = re.compile(r"^\s*intersection of\s+(.+?)\s+and\s+(.+?)\s*,\s*(.+?)\s*$", re.IGNORECASE)
 RE_REPORT_TYPE = re.compile(
     r"(?im)^\s*#(?P<kind>sticker|graffiti|grafitti)_(?:type|typ)\s*:?\s*(?P<val>[^\n#@]{1,200}?)"
@@ -18,5 +18,7 @@ ACC_GPS = 20
 # Location / API Constants
 OVERPASS_TIMEOUT_S = 45
 NOMINATIM_TIMEOUT_S = 15
+GEOCODE_NEG_TTL_S = 86400  # failed geocodes are not retried for a day
+OVERPASS_CACHE_TTL_S = 86400  # cached Overpass answers are refetched after a day (OSM data changes)
 MAX_GEOM_POINTS_PER_STREET = 100
 MAX_SEARCH_RADIUS_M = 500
@@ -135,6 +135,8 @@ def run_loop(cfg: Dict[str, Any], one_shot: bool = False) -> None:
             # CRITICAL: Periodic Save (every loop)
             # We save locally frequently, but sync to Git rarely/never in loop
             try:
+                # Durable: besides geocodes the cache holds reply dedupe keys and the
+                # startup/daily-summary markers; losing it would repeat those posts
                 save_json(CACHE_PATH, cache)
                 save_json(PENDING_PATH, pipeline.pending)
                 save_json(REPORTS_PATH, reports)
@@ -3,7 +3,7 @@ import time
 from pathlib import Path
 
 from .models import PipelineResult
-from .constants import ACC_FALLBACK, ACC_GPS
+from .constants import ACC_FALLBACK, ACC_GPS, GEOCODE_NEG_TTL_S
 from ..adapters.mastodon_api import (
     fetch_timeline, reply_once, is_approved_by_fav, send_dm
 )
@@ -138,11 +138,14 @@ class Pipeline:
             loc_text = f"{lat}, {lon}"
         elif q:
             # Geocode
-            # Check cache
-            if q in self.cache:
-                c = self.cache[q]
+            # Check cache; misses are cached too (lat None) and expire after GEOCODE_NEG_TTL_S
+            now = int(time.time())
+            c = self.cache.get(q)
+            if c and c.get("lat") is not None:
                 lat, lon = c["lat"], c["lon"]
                 method = c.get("method", "cache")
+            elif c and now - int(c.get("ts") or 0) < GEOCODE_NEG_TTL_S:
+                pass  # recently failed: don't hit Nominatim again yet
             else:
                 user_agent = self.cfg.get("user_agent", "HeatmapBot")
                 c_res, c_meth = geocode_query_worldwide(q, user_agent)
@@ -150,10 +153,10 @@ class Pipeline:
                     lat, lon = c_res
                     method = c_meth
                     # Update cache
-                    self.cache[q] = {"lat": lat, "lon": lon, "method": method, "ts": int(time.time())}
+                    self.cache[q] = {"lat": lat, "lon": lon, "method": method, "ts": now}
                 else:
                     # Fail
-                    pass
+                    self.cache[q] = {"lat": None, "lon": None, "method": "none", "ts": now}
 
         if not lat and not lon:
             # NEEDS INFO
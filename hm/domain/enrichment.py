@@ -1,11 +1,28 @@
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import re
 
 from ..utils.log import log_line
 
+def _make_session() -> requests.Session:
+    """
+    Keep-alive session for Wikipedia summaries, shared by the enrichment tool's
+    worker threads: one TLS connection per worker, with 429/5xx backoff.
+    """
+    s = requests.Session()
+    s.headers["User-Agent"] = "HeatmapOfFascismBot/1.0.0 (Research)"
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504), raise_on_status=False)
+    s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return s
+
+_SESSION = _make_session()
+
+_RE_WIKI_URL = re.compile(r"https://([a-z]+)\.wikipedia\.org/wiki/(.+)$")
+
 def load_sources_map(sources_path: Path) -> Dict[str, Dict[str, Any]]:
     """Load sources.json into a dict keyed by ID."""
     try:
@@ -24,15 +41,14 @@ def fetch_wikipedia_summary(url: str) -> Optional[str]:
     try:
         # Convert standard URL to API URL
         # e.g. https://de.wikipedia.org/wiki/AUF1 -> https://de.wikipedia.org/api/rest_v1/page/summary/AUF1
-        match = re.search(r"https://([a-z]+)\.wikipedia\.org/wiki/(.+)$", url)
+        match = _RE_WIKI_URL.search(url)
         if not match:
             return None
             
         lang, title = match.groups()
         api_url = f"https://{lang}.wikipedia.org/api/rest_v1/page/summary/{title}"
         
-        headers = {"User-Agent": "HeatmapOfFascismBot/1.0.0 (Research)"}
-        resp = requests.get(api_url, headers=headers, timeout=5)
+        resp = _SESSION.get(api_url, timeout=5)
         if resp.status_code == 200:
             data = resp.json()
             return data.get("extract")
@@ -40,6 +56,26 @@ def fetch_wikipedia_summary(url: str) -> Optional[str]:
         log_line(f"ENRICH WARN | wiki fetch failed {e!r}")
     return None
 
+def entity_desc_from_sources(ent: Dict[str, Any], sources_map: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Fetch a description for one entity from its first Wikipedia source.
+    Network only, no file access, so callers can run it for many entities in parallel.
+    Returns "" if no source yields a summary.
+    """
+    if not isinstance(ent, dict):
+        return ""
+    for sk in ent.get("sources", []):
+        src = sources_map.get(sk)
+        if not src:
+            continue
+
+        url = src.get("url", "")
+        if "wikipedia.org" in url:
+            summary = fetch_wikipedia_summary(url)
+            if summary:
+                return f"{summary} (Source: Wikipedia)"
+    return ""
+
 def enrich_entity(entity_key: str, entities_path: Path, sources_path: Path) -> bool:
     """
     Attempt to enrich a specific entity with description from its sources.
@@ -56,21 +92,7 @@ def enrich_entity(entity_key: str, entities_path: Path, sources_path: Path) -> b
         #     return False
             
         sources_map = load_sources_map(sources_path)
-        source_keys = ent.get("sources", [])
-        
-        new_desc = ""
-        
-        for sk in source_keys:
-            src = sources_map.get(sk)
-            if not src: 
-                continue
-                
-            url = src.get("url", "")
-            if "wikipedia.org" in url:
-                summary = fetch_wikipedia_summary(url)
-                if summary:
-                    new_desc = f"{summary} (Source: Wikipedia)"
-                    break
+        new_desc = entity_desc_from_sources(ent, sources_map)
         
         if new_desc and new_desc != ent.get("desc"):
             ent["desc"] = new_desc
@@ -11,6 +11,23 @@ class EntityRegistry:
     """
     def __init__(self, data: Dict[str, Any]):
         self.data = data
+        # Sorted-prefix index for matching: lowercased key -> (key, display),
+        # plus the distinct key lengths, longest first.
+        self._lc_index: Dict[str, Tuple[str, str]] = {}
+        for entity_key, entity_data in data.items():
+            if not entity_key or not isinstance(entity_data, dict):
+                continue
+            # First key wins if two keys only differ in case
+            self._lc_index.setdefault(entity_key.lower(), (entity_key, entity_data.get("display", entity_key)))
+        self._lc_lens = sorted({len(kl) for kl in self._lc_index}, reverse=True)
+        # First char -> key lengths starting with it, longest first: the first
+        # level of a trie, so each position only probes lengths that can match.
+        by_first: Dict[str, set] = {}
+        for kl in self._lc_index:
+            by_first.setdefault(kl[0], set()).add(len(kl))
+        self._lc_lens_by_first: Dict[str, Tuple[int, ...]] = {
+            c: tuple(sorted(lens, reverse=True)) for c, lens in by_first.items()
+        }
     
     @classmethod
     def from_file(cls, path: Path):
@@ -29,7 +46,8 @@ class EntityRegistry:
         Match a known entity from a sticker type string.
         
         Scans the sticker_type text for known entity keys (case-insensitive)
-        and returns the first match found.
+        and returns the match that starts earliest in the text; at the same
+        position the longest key wins (e.g. "AfD-Jugend" over "AfD").
         
         Args:
             sticker_type: The type/category string from a report
@@ -56,14 +74,22 @@ class EntityRegistry:
         # Normalize input for matching (lowercase for case-insensitive search)
         text_lower = sticker_type.lower()
         
-        # Scan all known entities
-        for entity_key, entity_data in self.data.items():
-            if not isinstance(entity_data, dict):
+        n = len(text_lower)
+        if not self._lc_lens or n < self._lc_lens[-1]:
+            return None, None
+        
+        # Slide over the text once, probing the index with each key length
+        index = self._lc_index
+        lens_by_first = self._lc_lens_by_first
+        for i in range(n):
+            lens = lens_by_first.get(text_lower[i])
+            if not lens:
                 continue
-            
-            # Check if entity key appears in text (case-insensitive)
-            if entity_key.lower() in text_lower:
-                display = entity_data.get("display", entity_key)
-                return entity_key, display
+            for length in lens:
+                if i + length > n:
+                    continue
+                hit = index.get(text_lower[i:i + length])
+                if hit:
+                    return hit
         
         return None, None
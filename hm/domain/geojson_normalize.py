@@ -1,8 +1,46 @@
 import json
+import re
+import zlib
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-def normalize_reports_geojson(reports: Dict[str, Any], entities_path: Path) -> None:
+# Bump whenever the normalization rules below change, so stamped features get redone.
+_NORM_VERSION = "v4"
+
+# Properties the normalization reads; a change to any of them invalidates the stamp.
+_NORM_INPUTS = ("description", "medium", "entity_key", "sticker_type", "created_date", "first_seen", "last_seen")
+# Properties it writes; edits to these (by hand or by other tools) invalidate it too,
+# so drifted outputs get repaired on the next pass.
+_NORM_OUTPUTS = (
+    "entity_display", "entity_desc", "entity_source_url", "category", "category_display", "needs_verification",
+    "first_seen_year", "first_seen_month", "first_seen_ym", "last_seen_year", "last_seen_month", "last_seen_ym",
+)
+
+# Raw "key=value" lines in legacy descriptions
+_RE_DESC_CAT = re.compile(r"cat=([^\n]+)")
+_RE_DESC_KIND = re.compile(r"kind=([^\n]+)")
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+def _sv(p: Dict[str, Any], k: str) -> str:
+    """Stripped string property; skips the str() round-trip for the common str/None cases."""
+    v = p.get(k)
+    if isinstance(v, str):
+        return v.strip()
+    return str(v).strip() if v else ""
+
+def _norm_sig(base: str, p: Dict[str, Any]) -> str:
+    """Stamp for one feature: normalization version, source mtimes and checksums of its inputs and outputs."""
+    raw_in = "\x1f".join(str(p.get(k) or "") for k in _NORM_INPUTS)
+    # str(), not `or ""`: False, None and "" are different outputs
+    raw_out = "\x1f".join(str(p.get(k)) for k in _NORM_OUTPUTS)
+    return f"{base}:{zlib.crc32(raw_in.encode('utf-8')):08x}:{zlib.crc32(raw_out.encode('utf-8')):08x}"
+
+def normalize_reports_geojson(reports: Dict[str, Any], entities_path: Path) -> int:
     """
     Normalize all features in the reports dictionary (in-place).
     
@@ -10,6 +48,12 @@ def normalize_reports_geojson(reports: Dict[str, Any], entities_path: Path) -> N
     - Entity fields (display, desc, category)
     - Date fields (year, month)
     - Verification status
+
+    Features are stamped with `_norm_sig`; a feature whose stamp still matches
+    (same rules version, same entities/sources files, same input fields and
+    untouched output fields) is skipped.
+
+    Returns the number of features (re)normalized; 0 means reports is unchanged.
     """
     
     # Load entities
@@ -22,13 +66,12 @@ def normalize_reports_geojson(reports: Dict[str, Any], entities_path: Path) -> N
         
     # Load sources
     sources_map = {}
+    # Assume sources.json is in same dir as entities.json or docs/sources.json
+    # We try strict path relative to entities_path parent or explicit docs/
+    sources_path = entities_path.parent / "docs" / "sources.json"
+    if not sources_path.exists():
+        sources_path = entities_path.parent / "sources.json"
     try:
-        # Assume sources.json is in same dir as entities.json or docs/sources.json
-        # We try strict path relative to entities_path parent or explicit docs/
-        sources_path = entities_path.parent / "docs" / "sources.json"
-        if not sources_path.exists():
-            sources_path = entities_path.parent / "sources.json"
-            
         if sources_path.exists():
              src_list = json.loads(sources_path.read_text(encoding="utf-8"))
              for s in src_list:
@@ -37,6 +80,15 @@ def normalize_reports_geojson(reports: Dict[str, Any], entities_path: Path) -> N
     except Exception:
         pass
 
+    # Lowercased key -> original key, built once for the case-insensitive lookup
+    # (first key wins, as with the previous linear scan)
+    entities_lc = {}
+    if isinstance(entities, dict):
+        for k in entities:
+            entities_lc.setdefault(k.lower(), k)
+
+    base_sig = f"{_NORM_VERSION}:{_mtime_ns(entities_path)}:{_mtime_ns(sources_path)}"
+
     def _ym_fields(d: str):
         # expects ISO date 'YYYY-MM-DD' (or empty)
         d = (str(d or "")).strip()
@@ -54,8 +106,8 @@ def normalize_reports_geojson(reports: Dict[str, Any], entities_path: Path) -> N
 
     # Hard safety: ensure properties.lat/lon exist and match geometry (GeoJSON is [lon,lat]).
     feats = (reports or {}).get("features") or []
-    import re
-    
+    modified = 0
+
     for f in feats:
         if not isinstance(f, dict):
             continue
@@ -71,20 +123,22 @@ def normalize_reports_geojson(reports: Dict[str, Any], entities_path: Path) -> N
             continue
 
         p = f.get("properties") or {}
+        if p.get("_norm_sig") and p["_norm_sig"] == _norm_sig(base_sig, p):
+            continue
         
         # RECOVERY: If properties are missing but description has raw data, recover it.
         # Description format: kind=sticker\ncat=1161\n...
-        desc_raw = str(p.get("description") or "")
-        if desc_raw:
+        desc_raw = p.get("description") or ""
+        if desc_raw and isinstance(desc_raw, str):
              # Recover sticker_type (cat)
              if not p.get("sticker_type"):
-                 m_cat = re.search(r"cat=([^\n]+)", desc_raw)
+                 m_cat = _RE_DESC_CAT.search(desc_raw)
                  if m_cat:
                      p["sticker_type"] = m_cat.group(1).strip()
              
              # Recover medium (kind)
              if not p.get("medium"):
-                 m_kind = re.search(r"kind=([^\n]+)", desc_raw)
+                 m_kind = _RE_DESC_KIND.search(desc_raw)
                  if m_kind:
                      p["medium"] = m_kind.group(1).strip()
 
@@ -93,10 +147,10 @@ def normalize_reports_geojson(reports: Dict[str, Any], entities_path: Path) -> N
             p["medium"] = "sticker"
 
         # entity fields (stable for filter/search)
-        ek = str(p.get("entity_key") or "").strip()
+        ek = _sv(p, "entity_key")
 
         # Resolve entity_key from sticker_type ONLY if it is a VERIFIED key in entities.json
-        st = str(p.get("sticker_type") or "").strip()
+        st = _sv(p, "sticker_type")
         
         # Case insensitive lookup logic
         matched_key = None
@@ -106,12 +160,7 @@ def normalize_reports_geojson(reports: Dict[str, Any], entities_path: Path) -> N
             elif st.lower() in entities:
                 matched_key = st.lower()
             else:
-                # Iterate to find case-insensitive match
-                sl = st.lower()
-                for k in entities:
-                    if k.lower() == sl:
-                        matched_key = k
-                        break
+                matched_key = entities_lc.get(st.lower())
         
         if (not ek) and matched_key:
             p["entity_key"] = matched_key
@@ -175,3 +224,8 @@ def normalize_reports_geojson(reports: Dict[str, Any], entities_path: Path) -> N
             p["last_seen_year"], p["last_seen_month"], p["last_seen_ym"] = _ls
         else:
             p["last_seen_year"], p["last_seen_month"], p["last_seen_ym"] = None, None, ""
+
+        p["_norm_sig"] = _norm_sig(base_sig, p)
+        modified += 1
+
+    return modified
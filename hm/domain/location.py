@@ -1,15 +1,17 @@
 import math
 import re
 import time
+from collections import OrderedDict
 from typing import Optional, Tuple, List, Dict, Any
 # Import requests directly since we implemented helpers inline or use requests
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 # from ..adapters.umap_api import api_get, api_post <--- REMOVED
 # Re-implementing simplified versions here using requests directly might be easier if adapters are too thin.
-import requests
 from .dedup import haversine_m
 from ..core.constants import (
-    OVERPASS_TIMEOUT_S, NOMINATIM_TIMEOUT_S, 
+    OVERPASS_TIMEOUT_S, NOMINATIM_TIMEOUT_S, OVERPASS_CACHE_TTL_S,
     MAX_GEOM_POINTS_PER_STREET, MAX_SEARCH_RADIUS_M
 )
 from ..utils.log import log_line
@@ -22,23 +24,62 @@ OVERPASS_ENDPOINTS = (
     "https://overpass.openstreetmap.ru/api/interpreter",
 )
 
+def _make_session() -> requests.Session:
+    """
+    Keep-alive session for Nominatim/Overpass (no TCP/TLS handshake per lookup).
+    Retries back off on 429/5xx for GETs; Overpass POSTs are not retried here
+    because _overpass_post already fails over to the next endpoint.
+    """
+    s = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+_SESSION = _make_session()
+
+# Successful Overpass answers by whitespace-normalized query (LRU), stored as
+# (monotonic ts, data). Clustered reports re-issue identical POI/highway/building
+# queries; entries older than OVERPASS_CACHE_TTL_S are refetched so the
+# long-running bot sees OSM edits, and failures are not cached so a flaky
+# endpoint is retried next time.
+_OVERPASS_CACHE: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_OVERPASS_CACHE_MAX = 4096
+_RE_WS = re.compile(r"\s+")
+
+def clear_overpass_cache() -> None:
+    _OVERPASS_CACHE.clear()
+
 def _overpass_post(query: str, user_agent: str) -> Optional[Dict[str, Any]]:
+    key = _RE_WS.sub(" ", query).strip()
+    hit = _OVERPASS_CACHE.get(key)
+    if hit is not None:
+        if time.monotonic() - hit[0] < OVERPASS_CACHE_TTL_S:
+            _OVERPASS_CACHE.move_to_end(key)
+            return hit[1]
+        del _OVERPASS_CACHE[key]
+
     headers = {"User-Agent": user_agent}
     for ep in OVERPASS_ENDPOINTS:
         try:
-            r = requests.post(ep, data=query, headers=headers, timeout=OVERPASS_TIMEOUT_S)
+            r = _SESSION.post(ep, data=query, headers=headers, timeout=OVERPASS_TIMEOUT_S)
             if r.status_code != 200:
                 continue
-            return r.json()
+            data = r.json()
         except Exception:
             continue
+        _OVERPASS_CACHE[key] = (time.monotonic(), data)
+        if len(_OVERPASS_CACHE) > _OVERPASS_CACHE_MAX:
+            _OVERPASS_CACHE.popitem(last=False)
+        return data
     return None
 
 def geocode_nominatim(query: str, user_agent: str) -> Optional[Tuple[float, float]]:
     headers = {"User-Agent": user_agent}
     params = {"q": query, "format": "json", "limit": 1}
     try:
-        r = requests.get(NOMINATIM_URL, params=params, headers=headers, timeout=NOMINATIM_TIMEOUT_S)
+        r = _SESSION.get(NOMINATIM_URL, params=params, headers=headers, timeout=NOMINATIM_TIMEOUT_S)
         if r.status_code == 200:
             data = r.json()
             if data:
@@ -67,6 +108,8 @@ def geocode_query_worldwide(query: str, user_agent: str) -> Tuple[Optional[Tuple
 # COORDINATE PROJECTION HELPERS
 # =========================
 
+_R_EARTH = 6371000.0  # Earth radius in meters
+
 def _xy_m(lat0: float, lon0: float, lat: float, lon: float) -> Tuple[float, float]:
     """
     Equirectangular projection around (lat0, lon0) -> meters.
@@ -81,9 +124,12 @@ def _xy_m(lat0: float, lon0: float, lat: float, lon: float) -> Tuple[float, floa
     Returns:
         (x, y) coordinates in meters relative to (lat0, lon0)
     """
-    R = 6371000.0  # Earth radius in meters
-    x = math.radians(lon - lon0) * R * math.cos(math.radians(lat0))
-    y = math.radians(lat - lat0) * R
+    return _xy_m_precomp(lat0, lon0, math.cos(math.radians(lat0)), lat, lon)
+
+def _xy_m_precomp(lat0: float, lon0: float, cos_lat0: float, lat: float, lon: float) -> Tuple[float, float]:
+    """_xy_m with cos(lat0) computed once by the caller."""
+    x = math.radians(lon - lon0) * _R_EARTH * cos_lat0
+    y = math.radians(lat - lat0) * _R_EARTH
     return x, y
 
 def _latlon_from_xy(lat0: float, lon0: float, x: float, y: float) -> Tuple[float, float]:
@@ -99,9 +145,12 @@ def _latlon_from_xy(lat0: float, lon0: float, x: float, y: float) -> Tuple[float
     Returns:
         (lat, lon) coordinates
     """
-    R = 6371000.0
-    lat = lat0 + math.degrees(y / R)
-    lon = lon0 + math.degrees(x / (R * math.cos(math.radians(lat0))))
+    return _latlon_from_xy_precomp(lat0, lon0, math.cos(math.radians(lat0)), x, y)
+
+def _latlon_from_xy_precomp(lat0: float, lon0: float, cos_lat0: float, x: float, y: float) -> Tuple[float, float]:
+    """_latlon_from_xy with cos(lat0) computed once by the caller."""
+    lat = lat0 + math.degrees(y / _R_EARTH)
+    lon = lon0 + math.degrees(x / (_R_EARTH * cos_lat0))
     return lat, lon
 
 def _nearest_point_on_polyline_m(
@@ -126,17 +175,23 @@ def _nearest_point_on_polyline_m(
         - best_dist_m: Distance in meters
         - best_seg_dir_xy_unit: (ux, uy) unit vector of segment direction
     """
-    qx, qy = _xy_m(lat0, lon0, qlat, qlon)
-    best = None
-
-    for i in range(len(pts) - 1):
-        a_lat, a_lon = pts[i]
-        b_lat, b_lon = pts[i + 1]
-        ax, ay = _xy_m(lat0, lon0, a_lat, a_lon)
-        bx, by = _xy_m(lat0, lon0, b_lat, b_lon)
+    # Project every vertex once (_xy_m_precomp inlined, cos hoisted out of
+    # the loop); only the winning point is converted back to lat/lon.
+    R = _R_EARTH
+    cos0 = math.cos(math.radians(lat0))
+    rad = math.radians
+    qx = rad(qlon - lon0) * R * cos0
+    qy = rad(qlat - lat0) * R
+    xy = [(rad(lon - lon0) * R * cos0, rad(lat - lat0) * R) for lat, lon in pts]
+
+    best_dist = None
+    best_p = best_d = None
+    ax, ay = xy[0] if xy else (0.0, 0.0)
+    for bx, by in xy[1:]:
         dx, dy = bx - ax, by - ay
         seg2 = dx*dx + dy*dy
         if seg2 <= 1e-9:  # Skip degenerate segments
+            ax, ay = bx, by
             continue
         
         # Project query point onto line segment (parameterized as a + t*(b-a))
@@ -146,17 +201,19 @@ def _nearest_point_on_polyline_m(
         px, py = ax + t*dx, ay + t*dy
         dist = ((qx - px)**2 + (qy - py)**2) ** 0.5
 
-        # Unit direction vector of segment
-        seg_len = (seg2 ** 0.5)
-        ux, uy = dx/seg_len, dy/seg_len
+        if best_dist is None or dist < best_dist:
+            best_dist = dist
+            best_p = (px, py)
+            best_d = (dx, dy, seg2)
+        ax, ay = bx, by
 
-        if best is None or dist < best[2]:
-            plat, plon = _latlon_from_xy(lat0, lon0, px, py)
-            best = (plat, plon, dist, (ux, uy))
-
-    if best is None:
+    if best_dist is None:
         return qlat, qlon, float("inf"), (1.0, 0.0)
-    return best
+    plat, plon = _latlon_from_xy_precomp(lat0, lon0, cos0, *best_p)
+    # Unit direction vector of segment
+    dx, dy, seg2 = best_d
+    seg_len = seg2 ** 0.5
+    return plat, plon, best_dist, (dx/seg_len, dy/seg_len)
 
 # =========================
 # LOCATION SNAPPING
@@ -217,6 +274,15 @@ def snap_to_public_way(lat: float, lon: float, user_agent: str) -> Tuple[float,
     
     lat0, lon0 = lat, lon
 
+    # Projection around the original point; cos(lat0) is the same for every call
+    cos_lat0 = math.cos(math.radians(lat0))
+
+    def to_xy(qlat: float, qlon: float) -> Tuple[float, float]:
+        return _xy_m_precomp(lat0, lon0, cos_lat0, qlat, qlon)
+
+    def from_xy(x: float, y: float) -> Tuple[float, float]:
+        return _latlon_from_xy_precomp(lat0, lon0, cos_lat0, x, y)
+
     # ----- Helper: Check if OSM way is publicly accessibly -----
     def is_public(tags: Dict[str, Any]) -> bool:
         """Check if an OSM way is publicly accessible based on tags."""
@@ -264,20 +330,24 @@ out ids;
         elems = data.get("elements") or []
         return bool(elems)
 
-    # ----- Helper: Fetch street furniture POIs -----
-    def fetch_pois(r_m: int) -> List[Dict[str, Any]]:
+    # ----- Helper: Fetch street furniture POIs and highways in one request -----
+    def fetch_pois_and_highways(r_poi_m: int, r_hw_m: int) -> List[Dict[str, Any]]:
         """
-        Fetch public-ish street furniture POIs suitable for sticker reports.
-        Includes benches, waste bins, and street lamps.
+        Fetch public-ish street furniture POIs (benches, waste bins, street lamps)
+        within r_poi_m and all highway ways within r_hw_m in a single Overpass call.
+        POIs come back as nodes and highways as ways, so the consumers below
+        demultiplex by element type.
         """
         q = f"""
 [out:json][timeout:25];
 (
-  node(around:{r_m},{lat0},{lon0})["leisure"="bench"];
-  node(around:{r_m},{lat0},{lon0})["amenity"~"^(waste_basket|waste_disposal)$"];
-  node(around:{r_m},{lat0},{lon0})["highway"="street_lamp"];
-);
-out tags;
+  node(around:{r_poi_m},{lat0},{lon0})["leisure"="bench"];
+  node(around:{r_poi_m},{lat0},{lon0})["amenity"~"^(waste_basket|waste_disposal)$"];
+  node(around:{r_poi_m},{lat0},{lon0})["highway"="street_lamp"];
+)->.pois;
+way(around:{r_hw_m},{lat0},{lon0})["highway"]->.ways;
+.pois out body;
+.ways out tags geom;
 """.strip()
         data = _overpass_post(q, user_agent)
         if not data or not isinstance(data, dict):
@@ -286,12 +356,11 @@ out tags;
         return elems if isinstance(elems, list) else []
 
     # ----- Helper: Find nearest POI -----
-    def nearest_public_poi(r_m: int = 15) -> Optional[Tuple[float, float, str]]:
+    def nearest_public_poi(elems: List[Dict[str, Any]]) -> Optional[Tuple[float, float, str]]:
         """
-        Find nearest public street furniture POI.
+        Find nearest public street furniture POI among the fetched nodes.
         Returns (lat, lon, note) or None.
         """
-        elems = fetch_pois(r_m)
         best = None  # (dist_m, lat, lon, note)
         for e in elems:
             if e.get("type") != "node":
@@ -316,27 +385,16 @@ out tags;
         return None if best is None else (best[1], best[2], best[3])
 
     # ----- Helper: Fetch highways -----
-    def fetch_highways(r_m: int, only_walk: bool) -> List[Dict[str, Any]]:
+    def fetch_walkways(r_m: int) -> List[Dict[str, Any]]:
         """
-        Fetch highway ways from OSM.
-        If only_walk=True, only fetch walkable types (footway, path, etc).
-        Otherwise fetch all highways.
+        Fetch walkable highway ways (footway, path, etc) from OSM.
         """
-        if only_walk:
-            q = f"""
+        q = f"""
 [out:json][timeout:25];
 (
   way(around:{r_m},{lat0},{lon0})["highway"~"^(footway|path|pedestrian|steps|cycleway)$"];
 );
 out tags geom;
-""".strip()
-        else:
-            q = f"""
-[out:json][timeout:25];
-(
-  way(around:{r_m},{lat0},{lon0})["highway"];
-);
-out tags geom;
 """.strip()
         data = _overpass_post(q, user_agent)
         if not data or not isinstance(data, dict):
@@ -393,16 +451,18 @@ out tags geom;
     # MAIN SNAPPING LOGIC
     # =========================
 
+    # POIs (15m) and highways (base radius) arrive in one round-trip
+    elems = fetch_pois_and_highways(15, R_M)
+
     # Step 0: Prefer nearby public street-furniture POIs (most precise)
-    poi = nearest_public_poi(r_m=15)
+    poi = nearest_public_poi(elems)
     if poi:
         plat, plon, pnote = poi
         # Sanity check: ignore POIs that would land on/inside buildings
         if not building_nearby(plat, plon, r_m=4):
             return plat, plon, f"snap_poi:{pnote}"
 
-    # Step 1: Fetch highways in base radius
-    elems = fetch_highways(R_M, only_walk=False)
+    # Step 1: Highways in base radius
     cands = collect_candidates(elems)
     if not cands:
         return lat, lon, ""  # No ways found, return original
@@ -428,7 +488,7 @@ out tags geom;
 
     # Step 3: If only road found, try wider search for walkways
     if kind == "road":
-        elems2 = fetch_highways(R_WALK_M, only_walk=True)
+        elems2 = fetch_walkways(R_WALK_M)
         cands2 = collect_candidates(elems2)
         best_walk = None
         for hw2, pts2, tags2 in cands2:
@@ -447,15 +507,14 @@ out tags geom;
         nx, ny = (-uy, ux)
         
         # Choose side that points toward original location (reduces wrong-side jumps)
-        sx, sy = _xy_m(lat0, lon0, plat, plon)   # snapped -> meters
-        ox, oy = _xy_m(lat0, lon0, lat0, lon0)   # original -> (0,0)
-        vx, vy = (ox - sx), (oy - sy)            # snapped -> original
+        sx, sy = to_xy(plat, plon)   # snapped -> meters
+        vx, vy = -sx, -sy            # snapped -> original (origin is (0,0))
         if (vx*nx + vy*ny) < 0:
             nx, ny = (-nx, -ny)
         
         # Apply offset
         sx2, sy2 = (sx + nx*OFFSET_ROAD_M), (sy + ny*OFFSET_ROAD_M)
-        plat, plon = _latlon_from_xy(lat0, lon0, sx2, sy2)
+        plat, plon = from_xy(sx2, sy2)
         note = f"snap_road_offset:{hw}"
 
     # Step 5: Building avoidance - push further away if still too close
@@ -463,16 +522,16 @@ out tags geom;
         if kind == "road":
             # Reuse perpendicular direction
             nx, ny = (-uy, ux)
-            sx, sy = _xy_m(lat0, lon0, plat, plon)
+            sx, sy = to_xy(plat, plon)
             sx2, sy2 = (sx + nx*OFFSET_BUILDING_M), (sy + ny*OFFSET_BUILDING_M)
-            plat, plon = _latlon_from_xy(lat0, lon0, sx2, sy2)
+            plat, plon = from_xy(sx2, sy2)
             note += "|avoid_building"
         else:
             # Walk: minimal nudge
             nx, ny = (-uy, ux)
-            sx, sy = _xy_m(lat0, lon0, plat, plon)
+            sx, sy = to_xy(plat, plon)
             sx2, sy2 = (sx + nx*4.0), (sy + ny*4.0)
-            plat, plon = _latlon_from_xy(lat0, lon0, sx2, sy2)
+            plat, plon = from_xy(sx2, sy2)
             note += "|avoid_building"
 
     return plat, plon, note
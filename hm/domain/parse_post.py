@@ -1,43 +1,74 @@
+import functools
+import html
 import re
-from typing import Tuple, List, Dict, Any, Optional
+from typing import Tuple, Any, Optional, Iterable, Mapping
 from ..core.constants import RE_REPORT_TYPE, RE_NOTE, RE_COORDS, RE_ADDRESS, RE_CROSS, RE_STREET_CITY, RE_INTERSECTION
 from ..core.models import Kind
 
+# strip_html: paragraph breaks and <br> become newlines first, then any other
+# tag is dropped. Must stay two passes: a literal "<" before a break would
+# otherwise swallow the break and the text between them.
+_RE_HTML_BREAK = re.compile(r"</p>\s*<p[^>]*>|</p>|<br\s*/?>", re.IGNORECASE)
+_RE_HTML_TAG = re.compile(r"<[^>]+>")
+_RE_WS = re.compile(r"[ \t\f\v]+")
+_RE_NL = re.compile(r"\n{2,}")
+
+# normalize_location_line
+_RE_ORT_PREFIX = re.compile(r"(?i)^\s*(ort|location|place)\s*:\s*")
+_RE_STR_DOT = re.compile(r"(?i)(?<=\w)str\.\b")
+_RE_STR = re.compile(r"(?i)(?<=\w)str\b")
+_RE_DOT_COMMA = re.compile(r"\.,")
+_RE_SPACES = re.compile(r"\s+")
+
+# parse_location
+_html_unescape = html.unescape
+_RE_DMS = re.compile(
+    r"(\d{1,3})\s*[°º]\s*(\d{1,2})\s*[\'’′]\s*(\d{1,2}(?:[\.,]\d+)?)\s*(?:[\"”″])?\s*([NSEW])",
+    re.IGNORECASE,
+)
+_RE_PURE_MENTIONS = re.compile(r"(?:@\w+(?:@\w+)?)(?:\s+@\w+(?:@\w+)?)*")
+# RE_ADDRESS, RE_CROSS and RE_STREET_CITY in one alternation, tried in that order.
+# RE_CROSS keeps its IGNORECASE flag via a scoped inline flag.
+_RE_LOC_ANY = re.compile(
+    f"(?P<addr>{RE_ADDRESS.pattern})"
+    f"|(?P<cross>(?i:{RE_CROSS.pattern}))"
+    f"|(?P<sc>{RE_STREET_CITY.pattern})"
+)
+
+# parse_type_and_medium: #<kind>_type tag (lowercased) -> Kind, with the common typo folded in
+_KIND_OF = {"sticker": Kind.STICKER, "graffiti": Kind.GRAFFITI, "grafitti": Kind.GRAFFITI}
+
 def strip_html(s: str) -> str:
     s = s or ""
-    s = re.sub(r"</p>\s*<p[^>]*>", "\n", s, flags=re.IGNORECASE)
-    s = re.sub(r"</p>", "\n", s, flags=re.IGNORECASE)
-    s = re.sub(r"<br\s*/?>", "\n", s, flags=re.IGNORECASE)
-    s = re.sub(r"<[^>]+>", "", s)
-    s = re.sub(r"[ \t\f\v]+", " ", s)
-    s = re.sub(r"\n{2,}", "\n", s)
+    if "<" in s:
+        s = _RE_HTML_TAG.sub("", _RE_HTML_BREAK.sub("\n", s))
+    s = _RE_WS.sub(" ", s)
+    s = _RE_NL.sub("\n", s)
     return s.strip()
 
 def parse_type_and_medium(text: str) -> Tuple[Optional[Kind], str, Optional[str]]:
     """Return (Kind, sticker_type, err)."""
-    kinds = []
-    vals = []
+    has_st = False
+    has_gr = False
+    first_val = None
     for m in RE_REPORT_TYPE.finditer(text or ""):
-        k = (m.group("kind") or "").strip().lower()
-        if k == "grafitti":
-            k = "graffiti"
         v = (m.group("val") or "").strip()
-        if v:
-            kinds.append(k)
-            vals.append(v)
-    
-    if not kinds:
+        if not v:
+            continue
+        if _KIND_OF[m.group("kind").lower()] is Kind.GRAFFITI:
+            has_gr = True
+        else:
+            has_st = True
+        if has_st and has_gr:
+            return None, "unknown", "conflict"
+        if first_val is None:
+            first_val = v
+
+    if first_val is None:
         return None, "unknown", None
-    
-    has_st = "sticker" in kinds
-    has_gr = "graffiti" in kinds
-    
-    if has_st and has_gr:
-        return None, "unknown", "conflict"
-        
+
     kind = Kind.GRAFFITI if has_gr else Kind.STICKER
-    val = vals[0] if vals and vals[0] else "unknown"
-    return kind, val, None
+    return kind, first_val, None
 
 def parse_note(text: str) -> str:
     m = RE_NOTE.search(text or "")
@@ -48,11 +79,11 @@ def parse_note(text: str) -> str:
 
 def normalize_location_line(s: str) -> str:
     s = (s or "").strip()
-    s = re.sub(r"(?i)^\s*(ort|location|place)\s*:\s*", "", s)
-    s = re.sub(r"(?i)(?<=\w)str\.\b", "straße", s)
-    s = re.sub(r"(?i)(?<=\w)str\b", "straße", s)
-    s = re.sub(r"\.,", ",", s)
-    s = re.sub(r"\s+", " ", s)
+    s = _RE_ORT_PREFIX.sub("", s)
+    s = _RE_STR_DOT.sub("straße", s)
+    s = _RE_STR.sub("straße", s)
+    s = _RE_DOT_COMMA.sub(",", s)
+    s = _RE_SPACES.sub(" ", s)
     return s
 
 def heuristic_fix_crossing(candidate: str) -> str:
@@ -64,75 +95,92 @@ def heuristic_fix_crossing(candidate: str) -> str:
             candidate = f"{parts[0].strip()}, {parts[1].strip()}"
     return candidate
 
-def parse_location(text: str) -> Tuple[Optional[Tuple[float, float]], Optional[str]]:
-    import html as _html
-    text = _html.unescape(text)
-
-    # Accept DMS coord formats (Google Maps) before RE_COORDS
-    def _coords_dms(ss: str):
-        pat = r"(\d{1,3})\s*[°º]\s*(\d{1,2})\s*[\'’′]\s*(\d{1,2}(?:[\.,]\d+)?)\s*(?:[\"”″])?\s*([NSEW])"
-        hits = re.findall(pat, ss, flags=re.IGNORECASE)
-        if not hits:
-            return None
-        def to_dd(deg, minutes, seconds, hemi):
-            dd = float(deg) + float(minutes)/60.0 + float(str(seconds).replace(',', '.'))/3600.0
-            h = str(hemi).upper()
-            if h in ('S','W'):
-                dd = -dd
-            return dd, h
-        lat = None
-        lon = None
-        for deg, mi, sec, hemi in hits:
-            dd, h = to_dd(deg, mi, sec, hemi)
-            if h in ('N','S') and lat is None and -90.0 <= dd <= 90.0:
-                lat = dd
-            if h in ('E','W') and lon is None and -180.0 <= dd <= 180.0:
-                lon = dd
-            if lat is not None and lon is not None:
-                return (lat, lon)
-        return None
-
-    c_dms = _coords_dms(text)
-    if c_dms:
-        return (float(c_dms[0]), float(c_dms[1])), None
+def _dms_to_dd(deg: float, minutes: float, seconds: float, sign: float) -> float:
+    """Degrees/minutes/seconds -> signed decimal degrees (sign is -1.0 for S/W)."""
+    return sign * (deg + minutes/60.0 + seconds/3600.0)
 
-    m = RE_COORDS.search(text)
-    if m:
-        return (float(m.group(1)), float(m.group(2))), None
-
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+def _parse_dms(text: str) -> Optional[Tuple[float, float]]:
+    """Return (lat, lon) from the first N/S and E/W DMS coordinates in text, or None."""
+    hits = _RE_DMS.findall(text)
+    if not hits:
+        return None
+    lat = None
+    lon = None
+    for deg, mi, sec, hemi in hits:
+        h = hemi.upper()
+        dd = _dms_to_dd(float(deg), float(mi), float(sec.replace(',', '.')), -1.0 if h in ('S','W') else 1.0)
+        if h in ('N','S') and lat is None and -90.0 <= dd <= 90.0:
+            lat = dd
+        if h in ('E','W') and lon is None and -180.0 <= dd <= 180.0:
+            lon = dd
+        if lat is not None and lon is not None:
+            return (lat, lon)
+    return None
 
-    def is_pure_mentions(ln: str) -> bool:
-        return bool(re.fullmatch(r"(?:@\w+(?:@\w+)?)(?:\s+@\w+(?:@\w+)?)*", ln))
+def parse_location(text: str) -> Tuple[Optional[Tuple[float, float]], Optional[str]]:
+    # Pure function, so repeat texts (retries, restarts) come from the cache.
+    # Oversized texts bypass it rather than being truncated into a wrong key.
+    if len(text) <= 4096:
+        return _parse_location_cached(text)
+    return _parse_location(text)
+
+@functools.lru_cache(maxsize=1024)
+def _parse_location_cached(text: str) -> Tuple[Optional[Tuple[float, float]], Optional[str]]:
+    return _parse_location(text)
+
+def _parse_location(text: str) -> Tuple[Optional[Tuple[float, float]], Optional[str]]:
+    text = _html_unescape(text)
+
+    # Accept DMS coord formats (Google Maps) before RE_COORDS. Both patterns
+    # need a literal character most posts lack, so a substring test (memchr)
+    # skips the regex scan over the whole text in the common case.
+    if "°" in text or "º" in text:
+        c_dms = _parse_dms(text)
+        if c_dms:
+            return (float(c_dms[0]), float(c_dms[1])), None
+
+    if "." in text:
+        m = RE_COORDS.search(text)
+        if m:
+            return (float(m.group(1)), float(m.group(2))), None
 
-    for ln in lines:
-        low = ln.lower()
-        if low.startswith("#"):
+    for ln in text.splitlines():
+        ln = ln.strip()
+        if not ln:
+            continue
+        c0 = ln[0]
+        if c0 == "#":
+            continue
+        if c0 == "@" and _RE_PURE_MENTIONS.fullmatch(ln):
             continue
-        if low.startswith("@") and is_pure_mentions(ln):
+        # Every location pattern needs a comma; heuristic_fix_crossing only adds
+        # one for "/", "x" or "&" separators. Anything else can't match.
+        if "," not in ln and "/" not in ln and "&" not in ln and "x" not in ln:
             continue
 
         candidate = heuristic_fix_crossing(normalize_location_line(ln))
 
-        m = RE_ADDRESS.match(candidate)
-        if m:
-            street, number, city = m.group(1).strip(), m.group(2).strip(), m.group(3).strip()
+        m = _RE_LOC_ANY.match(candidate)
+        if not m:
+            continue
+        # Sub-groups of the matched branch follow its named group. The candidate is
+        # stripped and whitespace-collapsed, and every capture is bounded by \s* or
+        # the line ends, so the groups come back already trimmed.
+        kind = m.lastgroup
+        i = _RE_LOC_ANY.groupindex[kind]
+
+        if kind == "addr":
+            street, number, city = m.group(i + 1, i + 2, i + 3)
             return None, f"{street} {number}, {city}"
 
-        m = RE_CROSS.match(candidate)
-        if m:
-            a, b, city = m.group(1).strip(), m.group(2).strip(), m.group(3).strip()
+        if kind == "cross":
+            a, b, city = m.group(i + 1, i + 2, i + 3)
             return None, f"intersection of {a} and {b}, {city}"
 
-        m = RE_STREET_CITY.match(candidate)
-        if m:
-            street, city = m.group(1).strip(), m.group(2).strip()
-            return None, f"{street}, {city}"
+        street, city = m.group(i + 1, i + 2)
+        return None, f"{street}, {city}"
 
     return None, None
 
-def has_image(attachments: List[Dict[str, Any]]) -> bool:
-    for a in attachments or []:
-        if a.get("type") == "image" and a.get("url"):
-            return True
-    return False
+def has_image(attachments: Iterable[Mapping[str, Any]]) -> bool:
+    return any(a.get("type") == "image" and a.get("url") for a in attachments or ())
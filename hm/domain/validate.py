@@ -1,25 +1,34 @@
-from typing import List, Optional
+import functools
+import re
+from typing import List, Optional, Tuple
+
+@functools.lru_cache(maxsize=64)
+def _mention_pattern(bases: Tuple[str, ...]) -> "re.Pattern[str]":
+    """One alternation over all required mention bases (compiled once per set)."""
+    alt = "|".join(re.escape(b) for b in bases)
+    return re.compile(rf"(?i)(?:^|\s)@(?:{alt})(?:@[-\w\.]+)?\b")
 
 def validate_post_content(
-    text: str, 
+    text: str,
     attachments: List[dict],
     required_mentions: List[str]
 ) -> Optional[str]:
     """
     Returns None if valid, or reason string if invalid (ignored).
     """
-    # Check mentions
-    import re
-    has_mention = False
-    for m in (required_mentions or []):
-         base = str(m).strip().lstrip("@").split("@")[0]
-         if not base:
-             continue
-         if re.search(rf"(?i)(?:^|\s)@{re.escape(base)}(?:@[-\w\.]+)?\b", text):
-             has_mention = True
-             break
-    
+    text = text or ""
+    if required_mentions and "@" not in text:
+        return "missing_mention"
+
+    # Check mentions; only bases that occur as a substring need the regex boundary check
+    text_lower = text.lower()
+    bases = tuple(
+        b for b in (str(m).strip().lstrip("@").split("@")[0] for m in (required_mentions or []))
+        if b and b.lower() in text_lower
+    )
+    has_mention = bool(bases) and _mention_pattern(bases).search(text) is not None
+
     if required_mentions and not has_mention:
         return "missing_mention"
-        
+
     return None
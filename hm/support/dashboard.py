@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
+import bisect
 import curses
 import time
 import os
 import json
+import mmap
+import re
 import sys
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional; stdlib json also accepts UTF-8 bytes
+    _json_loads = json.loads
+
 # Resolve paths
 ROOT = Path(__file__).resolve().parent.parent.parent
 LOG_DIR = ROOT / "logs"
@@ -23,63 +35,214 @@ MUTE_OTHER = ROOT / ".mute_other"       # For all other messages
 def load_json_safe(path: Path, default):
     try:
         if path.exists():
-            return json.loads(path.read_text(encoding="utf-8"))
+            return _json_loads(path.read_bytes())
     except Exception:
         pass
     return default
 
+# Log level -> color pair; one scan per line, first level token in the line wins
+_LEVEL_RE = re.compile(r"ERROR|WARNING|INFO")
+_LEVEL_PAIR = {"ERROR": 1, "WARNING": 3, "INFO": 2}
+
+_JSON_CACHE = {}  # path -> ((mtime_ns, size), parsed)
+
+def load_json_cached(path: Path, default):
+    """Like load_json_safe, but only re-parses when the file's mtime or size changes."""
+    try:
+        st = path.stat()
+    except OSError:
+        _JSON_CACHE.pop(path, None)
+        return default
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _JSON_CACHE.get(path)
+    if hit and hit[0] == key:
+        return hit[1]
+    data = load_json_safe(path, default)
+    _JSON_CACHE[path] = (key, data)
+    return data
+
+_PENDING_COUNTS = [None, (0, 0)]  # [parsed list it was computed from, (pending, requests)]
+
+def pending_counts():
+    """(pending, other requests) in pending.json; recounted only after a reparse."""
+    pending_list = load_json_cached(PENDING_PATH, [])
+    if _PENDING_COUNTS[0] is not pending_list:
+        n_pending = sum(1 for p in pending_list if p.get("status", "").upper() == "PENDING")
+        _PENDING_COUNTS[:] = [pending_list, (n_pending, len(pending_list) - n_pending)]
+    return _PENDING_COUNTS[1]
+
+_FEATURE_COUNT = {}  # path -> ((size, mtime_ns), count)
+
+def count_features(path: Path) -> int:
+    """
+    Number of features in a GeoJSON file without parsing it: counts the
+    '"Feature"' type values via mmap. Cached until size or mtime changes.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return 0
+    key = (st.st_size, st.st_mtime_ns)
+    hit = _FEATURE_COUNT.get(path)
+    if hit and hit[0] == key:
+        return hit[1]
+    n = 0
+    try:
+        if st.st_size:
+            with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                needle = b'"Feature"'
+                pos = mm.find(needle)
+                while pos != -1:
+                    n += 1
+                    pos = mm.find(needle, pos + len(needle))
+    except (OSError, ValueError):
+        return hit[1] if hit else 0
+    _FEATURE_COUNT[path] = (key, n)
+    return n
+
 # Load Config (Global)
 CFG = load_json_safe(ROOT / "config.json", {})
 SECRETS = load_json_safe(ROOT / "secrets" / "secrets.json", {})
 CFG.update(SECRETS)
 
 # --- CACHED CHECKS ---
+# "until" is a time.monotonic() deadline
 _cache = {
-    "github": {"val": "UNKNOWN ⚪", "ts": 0},
-    "mastodon": {"val": "UNKNOWN ⚪", "ts": 0}
+    "github": {"val": ("UNKNOWN ⚪", 4), "until": 0},
+    "mastodon": {"val": ("UNKNOWN ⚪", 4), "until": 0}
 }
 CACHE_TTL = 900 # 15 minutes
+FAIL_TTL = 60   # failed probes are retried sooner
+
+# Probe results are (text, color pair id), classified where they are produced
+_UP = ("YES 🟢", 2)
+_DOWN = ("NO 🔴", 1)
+_CONF_ERR = ("CONF ERR 🔴", 1)
+_SKIPPED = ("SKIPPED ⚪", 4)
+
+def _cache_store(name, val):
+    ttl = CACHE_TTL if val is _UP else FAIL_TTL
+    _cache[name] = {"val": val, "until": time.monotonic() + ttl}
+    return val
+
+def _make_session() -> requests.Session:
+    s = requests.Session()
+    s.headers.update({"User-Agent": "hm-dashboard"})
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=2)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+# Keep-alive session shared by the reachability probes
+_SESSION = _make_session()
 
 def check_github():
-    now = time.time()
-    if now - _cache["github"]["ts"] < CACHE_TTL:
+    if time.monotonic() < _cache["github"]["until"]:
         return _cache["github"]["val"]
     
     try:
-        # Check API status or just google
-        r = requests.get("https://api.github.com", timeout=3)
-        val = "YES 🟢" if r.status_code == 200 else "NO 🔴"
+        # Check API status; only the status code matters
+        r = _SESSION.head("https://api.github.com", timeout=3, allow_redirects=False)
+        r.close()
+        val = _UP if r.status_code == 200 else _DOWN
     except Exception:
-        val = "NO 🔴"
+        val = _DOWN
         
-    _cache["github"] = {"val": val, "ts": now}
-    return val
+    return _cache_store("github", val)
 
 def check_mastodon():
-    now = time.time()
-    if now - _cache["mastodon"]["ts"] < CACHE_TTL:
+    if time.monotonic() < _cache["mastodon"]["until"]:
          return _cache["mastodon"]["val"]
          
     try:
         inst = CFG.get("instance_url", "").rstrip("/")
         token = CFG.get("access_token", "")
         if not inst or not token:
-            val = "CONF ERR 🔴"
+            val = _CONF_ERR
         else:
-            headers = {"Authorization": f"Bearer {token}"}
-            r = requests.get(f"{inst}/api/v1/accounts/verify_credentials", headers=headers, timeout=3)
-            val = "YES 🟢" if r.status_code == 200 else "NO 🔴"
+            # Token presence is only a config sanity check; liveness is an
+            # unauthenticated HEAD on the (usually cached) instance endpoint.
+            r = _SESSION.head(f"{inst}/api/v1/instance", timeout=3, allow_redirects=False)
+            r.close()
+            val = _UP if 200 <= r.status_code < 400 else _DOWN
     except Exception:
-        val = "NO 🔴"
+        val = _DOWN
         
-    _cache["mastodon"] = {"val": val, "ts": now}
-    return val
+    return _cache_store("mastodon", val)
 
 def format_number(n):
     if n >= 1000:
         return f"{n/1000:.1f}k"
     return str(n)
 
+# Incremental stats.jsonl reader state: only bytes appended since the last
+# tick are parsed. Each of the day/week/month windows is a deque of
+# (ts, event) sorted by ts, with counts kept in step as events enter (append)
+# and leave (popleft), so no tick rescans the window.
+_STATS_EVENTS = ("request", "pending", "published")
+_STATS_CACHE = {}
+
+def _reset_stats_cache(ino=None):
+    _STATS_CACHE.update(
+        ino=ino,
+        offset=0,
+        counts={evt: [0, 0, 0, 0] for evt in _STATS_EVENTS},  # Day, Week, Month, Total
+        windows=(deque(), deque(), deque()),                   # Day, Week, Month
+    )
+
+_reset_stats_cache()
+
+def _window_push(win, item):
+    if not win or win[-1][0] <= item[0]:
+        win.append(item)
+    else:
+        bisect.insort(win, item)  # out-of-order ts: keep the deque sorted
+
+def _read_new_stats(starts):
+    """Parse lines appended to stats.jsonl since the last call; resets on rotation/truncation."""
+    c = _STATS_CACHE
+    try:
+        st = STATS_PATH.stat()
+    except OSError:
+        _reset_stats_cache()
+        return
+    if st.st_ino != c["ino"] or st.st_size < c["offset"]:
+        _reset_stats_cache(st.st_ino)
+    if st.st_size == c["offset"]:
+        return
+
+    with STATS_PATH.open("rb") as f:
+        f.seek(c["offset"])
+        data = f.read(st.st_size - c["offset"])
+    # Leave a half-written last line for the next tick
+    end = data.rfind(b"\n") + 1
+    c["offset"] += end
+
+    counts = c["counts"]
+    windows = c["windows"]
+    for line in data[:end].splitlines():
+        try:
+            d = _json_loads(line)
+            evt = d.get("event")
+            if evt in counts:
+                ts = d.get("ts", 0)
+                if not isinstance(ts, (int, float)):
+                    ts = 0
+                row = counts[evt]
+                row[3] += 1
+                for i, start in enumerate(starts):
+                    if ts >= start:
+                        _window_push(windows[i], (ts, evt))
+                        row[i] += 1
+        except Exception:
+            pass
+
+def _expire_windows(starts):
+    counts = _STATS_CACHE["counts"]
+    for i, (start, win) in enumerate(zip(starts, _STATS_CACHE["windows"])):
+        while win and win[0][0] < start:
+            counts[win.popleft()[1]][i] -= 1
+
 def get_stats_table():
     # Read stats.jsonl
     # Format: {"ts": 123, "event": "type", "id": "..."}
@@ -87,45 +250,74 @@ def get_stats_table():
     day_start = now - (now % 86400) # Simple midnight (UTC approx, acceptable)
     week_start = now - (7 * 86400)
     month_start = now - (30 * 86400)
-    
-    counts = {
-        "request": [0, 0, 0, 0],   # Day, Week, Month, Total
-        "pending": [0, 0, 0, 0],
-        "published": [0, 0, 0, 0]
-    }
-    
+    starts = (day_start, week_start, month_start)
+
     try:
-        if STATS_PATH.exists():
-            with STATS_PATH.open("r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        d = json.loads(line)
-                        ts = d.get("ts", 0)
-                        evt = d.get("event")
-                        if evt in counts:
-                            # Total
-                            counts[evt][3] += 1
-                            # Intervals
-                            if ts >= month_start:
-                                counts[evt][2] += 1
-                                if ts >= week_start:
-                                    counts[evt][1] += 1
-                                    if ts >= day_start:
-                                        counts[evt][0] += 1
-                    except:
-                        pass
+        _read_new_stats(starts)
     except Exception:
         pass
-        
-    return counts
+    _expire_windows(starts)
 
-def get_bot_status():
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    bot_log = LOG_DIR / f"bot-{date_str}.log"
-    
-    if bot_log.exists():
-        mtime = bot_log.stat().st_mtime
-        age = time.time() - mtime
+    # Copies: the caller overrides the published total
+    return {evt: list(row) for evt, row in _STATS_CACHE["counts"].items()}
+
+_TAIL_CACHE = {}  # path -> ((size, mtime_ns, n), lines)
+
+def _tail(path: Path, n: int, st=None, chunk: int = 4096):
+    """
+    Last n lines of a file, read backwards in chunks until enough newlines
+    are found. Memoized until the file's size or mtime changes; pass the
+    caller's stat result to avoid a second stat.
+    """
+    if st is None:
+        st = path.stat()
+    key = (st.st_size, st.st_mtime_ns, n)
+    hit = _TAIL_CACHE.get(path)
+    if hit and hit[0] == key:
+        return hit[1]
+
+    blocks = []
+    newlines = 0
+    with path.open("rb") as f:
+        pos = f.seek(0, 2)
+        # n + 1 newlines: the first (possibly partial) line gets cut off below
+        while pos > 0 and newlines <= n:
+            step = min(chunk, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            newlines += block.count(b"\n")
+            blocks.append(block)
+    raw = b"".join(reversed(blocks)).splitlines()[-n:] if n > 0 else []
+    lines = [ln.decode("utf-8", errors="replace") for ln in raw]
+    _TAIL_CACHE[path] = (key, lines)
+    return lines
+
+_BOT_LOG = (None, None)  # (date ordinal, path)
+
+def _bot_log_path(now=None) -> Path:
+    """
+    Today's bot log path; only rebuilt when the date changes. The UI thread and
+    the worker both call this: the pair is read once and swapped as one tuple,
+    so neither can see a new day with the old path.
+    """
+    global _BOT_LOG
+    now = now or datetime.now()
+    day = now.toordinal()
+    cached_day, path = _BOT_LOG
+    if cached_day != day:
+        path = LOG_DIR / f"bot-{now.strftime('%Y-%m-%d')}.log"
+        _BOT_LOG = (day, path)
+    return path
+
+def get_bot_status(now=None):
+    try:
+        st = os.stat(_bot_log_path(now))
+    except OSError:
+        st = None
+
+    if st is not None:
+        age = time.time() - st.st_mtime
         if age < 60:
             return "ONLINE 🟢", curses.color_pair(2)
         elif age < 300:
@@ -134,26 +326,90 @@ def get_bot_status():
             return f"OFFLINE ({int(age)}s) 🔴", curses.color_pair(1)
     return "NO LOGS ⚪", curses.color_pair(4)
 
-def get_log_tail(lines_count=10):
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    bot_log = LOG_DIR / f"bot-{date_str}.log"
-    
-    if not bot_log.exists():
+def get_log_tail(lines_count=10, now=None):
+    bot_log = _bot_log_path(now)
+    try:
+        st = os.stat(bot_log)
+    except FileNotFoundError:
         return ["No log file for today."]
-        
+    except OSError as e:
+        return [f"Error reading logs: {e}"]
+
     try:
-        file_size = bot_log.stat().st_size
-        read_size = min(file_size, 10000)
-        
-        with bot_log.open("rb") as f:
-            if file_size > read_size:
-                f.seek(-read_size, 2)
-            content = f.read().decode("utf-8", errors="replace")
-            lines = content.splitlines()
-            return lines[-lines_count:]
+        return _tail(bot_log, lines_count, st)
     except Exception as e:
         return [f"Error reading logs: {e}"]
 
+# --- BACKGROUND REFRESH ---
+# Everything that touches the network or the data files runs in one worker
+# thread; the curses loop only reads a snapshot of STATE.
+REFRESH_S = 2
+STATE = {
+    "github": _cache["github"]["val"],
+    "mastodon": _cache["mastodon"]["val"],
+    "stats": {evt: [0, 0, 0, 0] for evt in _STATS_EVENTS},
+    "pending": (0, 0),
+    "published": 0,
+    "logs": [],
+    "log_lines": 10,  # set by the UI from the window height
+}
+_STATE_LOCK = threading.Lock()
+# Set whenever STATE changes; the UI only rebuilds the full frame when it is set
+DIRTY = threading.Event()
+DIRTY.set()
+
+def _state_update(update):
+    with _STATE_LOCK:
+        changed = any(STATE.get(k) != v for k, v in update.items())
+        if changed:
+            STATE.update(update)
+    if changed:
+        DIRTY.set()
+
+def _refresh_local():
+    """Re-read the local data files into STATE (stats, counts, log tail)."""
+    with _STATE_LOCK:
+        n_lines = STATE["log_lines"]
+    stats = get_stats_table()
+    # Cached on reports.geojson size+mtime, so this is a stat() per tick
+    published = count_features(REPORTS_PATH)
+    # FIX: Override Total Published (Stats) with actual DB count
+    # Because stats.jsonl only has new events, but Total should show full history.
+    stats["published"][3] = published
+    _state_update({
+        "stats": stats,
+        "pending": pending_counts(),
+        "published": published,
+        "logs": get_log_tail(n_lines),
+    })
+
+def _refresh_worker(show_remote_checks: bool):
+    while True:
+        try:
+            _refresh_local()
+        except Exception:
+            pass  # keep the worker alive; the UI shows the last good values
+
+        # The checks return their cached value until their own TTL runs out
+        if show_remote_checks:
+            _state_update({"github": check_github(), "mastodon": check_mastodon()})
+
+        time.sleep(REFRESH_S)
+
+_LOAD = [None, 0.0]  # [1-min load or None if unavailable, monotonic ts]
+LOAD_TTL = 5
+
+def get_load1():
+    """1-minute load average, re-read at most every LOAD_TTL seconds; None where unsupported."""
+    t = time.monotonic()
+    if _LOAD[1] == 0.0 or t - _LOAD[1] > LOAD_TTL:
+        try:
+            load1 = os.getloadavg()[0]
+        except (OSError, AttributeError):
+            load1 = None
+        _LOAD[:] = [load1, t]
+    return _LOAD[0]
+
 def draw_box(stdscr, y, x, h, w, title=""):
     try:
         stdscr.attron(curses.color_pair(5))
@@ -171,7 +427,26 @@ def draw_box(stdscr, y, x, h, w, title=""):
     except curses.error:
         pass
 
-def main(stdscr):
+def _handle_key(k) -> bool:
+    """Act on a key press; False means quit."""
+    try:
+        if k == ord('q'): return False
+        elif k == ord('r') or k == ord('R'):
+            # Toggle reports mute
+            if MUTE_REPORTS.exists():
+                MUTE_REPORTS.unlink()
+            else:
+                MUTE_REPORTS.touch()
+        elif k == ord('o') or k == ord('O'):
+            # Toggle other messages mute
+            if MUTE_OTHER.exists():
+                MUTE_OTHER.unlink()
+            else:
+                MUTE_OTHER.touch()
+    except Exception: pass
+    return True
+
+def main(stdscr, show_remote_checks: bool = True):
     curses.start_color()
     curses.use_default_colors()
     curses.init_pair(1, curses.COLOR_RED, -1)
@@ -182,32 +457,70 @@ def main(stdscr):
     curses.init_pair(6, curses.COLOR_CYAN, -1)
 
     curses.curs_set(0)
-    stdscr.nodelay(True)
+    # getch() waits up to 1s (the clock's resolution); keys still act immediately
+    stdscr.timeout(1000)
+
+    if not show_remote_checks:
+        STATE["github"] = STATE["mastodon"] = _SKIPPED
+    # Local files are cheap: fill STATE once so the first frame has real counts
+    try:
+        _refresh_local()
+    except Exception:
+        pass
+    threading.Thread(target=_refresh_worker, args=(show_remote_checks,), daemon=True).start()
 
+    last_size = None
+    last_view = None
     while True:
-        stdscr.clear()
         h, w = stdscr.getmaxyx()
+        now = datetime.now()
+        time_str = now.strftime("%Y-%m-%d %H:%M:%S")
+        status_txt, status_color = get_bot_status(now)
+        load1 = get_load1()
+        load_txt = f"Load: {load1:.2f}" if load1 is not None else "Load: n/a"
+        reports_muted = os.path.lexists(MUTE_REPORTS)
+        other_muted = os.path.lexists(MUTE_OTHER)
+
+        # Nothing but the clock changed: update that line only
+        view = (h, w, status_txt, load_txt, reports_muted, other_muted)
+        if view == last_view and not DIRTY.is_set():
+            try:
+                stdscr.move(1, 0)
+                stdscr.clrtoeol()
+                stdscr.addstr(1, (w - len(time_str)) // 2, time_str)
+            except curses.error:
+                pass
+            stdscr.refresh()
+            if not _handle_key(stdscr.getch()):
+                break
+            continue
+        last_view = view
+        DIRTY.clear()
+
+        with _STATE_LOCK:
+            snap = dict(STATE)
+
+        # erase() only resets the in-memory window; refresh() then sends just the
+        # changed cells. A full clear() repaint is only needed after a resize.
+        if (h, w) != last_size:
+            stdscr.clear()
+            last_size = (h, w)
+        else:
+            stdscr.erase()
         
         # --- HEADER ---
         title = " 🔥 HEATMAP OF FASCISM BOT MONITOR 🔥 "
         stdscr.addstr(0, (w - len(title)) // 2, title, curses.A_BOLD | curses.color_pair(6))
-        time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         stdscr.addstr(1, (w - len(time_str)) // 2, time_str)
 
         # --- SYSTEM STATUS ---
-        status_txt, status_color = get_bot_status()
-        github_st = check_github()
-        masto_st = check_mastodon()
-        
-        load1, _, _ = os.getloadavg()
-        load_txt = f"Load: {load1:.2f}"
+        github_st = snap["github"]
+        masto_st = snap["mastodon"]
         
         box_h = 6 
         draw_box(stdscr, 2, 1, box_h, w//2-2, "System Status")
         
         # --- MESSAGE CONTROLS ---
-        reports_muted = MUTE_REPORTS.exists()
-        other_muted = MUTE_OTHER.exists()
         
         ctrl_box_x = w//2 + 1
         ctrl_box_w = w//2 - 3
@@ -240,35 +553,23 @@ def main(stdscr):
         gh_label = "GitHub Server: "
         ms_label = "Mastodon Server: "
         
-        def get_col(s):
-            if "🟢" in s: return curses.color_pair(2)
-            if "🔴" in s: return curses.color_pair(1)
-            return curses.color_pair(4)
-            
         stdscr.addstr(4, 3, gh_label, curses.A_BOLD)
-        stdscr.addstr(github_st, get_col(github_st))
+        stdscr.addstr(github_st[0], curses.color_pair(github_st[1]))
         
         mid_x = w // 2
         stdscr.addstr(4, mid_x, ms_label, curses.A_BOLD)
-        stdscr.addstr(masto_st, get_col(masto_st))
+        stdscr.addstr(masto_st[0], curses.color_pair(masto_st[1]))
         
 
         # --- STATISTICS TABLE ---
         # "Mastodon Statistics"
         # Columns: Metric | Day | Week | Month | Total
         
-        stats = get_stats_table()
+        stats = snap["stats"]
         
         # Also need CURRENT state counts
-        pending_list = load_json_safe(PENDING_PATH, [])
-        reports = load_json_safe(REPORTS_PATH, {"features": []})
-        current_pending = sum(1 for p in pending_list if p.get("status", "").upper() == "PENDING")
-        current_requests = len(pending_list) - current_pending
-        current_published = len(reports.get("features", []))
-
-        # FIX: Override Total Published (Stats) with actual DB count
-        # Because stats.jsonl only has new events, but Total should show full history.
-        stats["published"][3] = current_published
+        current_pending, current_requests = snap["pending"]
+        current_published = snap["published"]
 
         # Table Layout
         col_w = 9
@@ -317,38 +618,23 @@ def main(stdscr):
         log_h = h - (2 + box_h + stats_h) - 1
         if log_h > 4:
             draw_box(stdscr, 2 + box_h + stats_h, 1, log_h, w-2, "Live Logs")
-            logs = get_log_tail(log_h - 2)
+            with _STATE_LOCK:
+                STATE["log_lines"] = log_h - 2
+            logs = snap["logs"]
             for idx, line in enumerate(logs):
                 try:
-                    attr = curses.A_NORMAL
-                    if "ERROR" in line: attr = curses.color_pair(1)
-                    elif "WARNING" in line: attr = curses.color_pair(3)
-                    elif "INFO" in line: attr = curses.color_pair(2)
+                    m = _LEVEL_RE.search(line)
+                    attr = curses.color_pair(_LEVEL_PAIR[m.group()]) if m else curses.A_NORMAL
                     line = line[:w-5]
                     stdscr.addstr(2 + box_h + stats_h + 1 + idx, 3, line, attr)
                 except curses.error: pass
 
         stdscr.refresh()
-        try:
-            k = stdscr.getch()
-            if k == ord('q'): break
-            elif k == ord('r') or k == ord('R'):
-                # Toggle reports mute
-                if MUTE_REPORTS.exists():
-                    MUTE_REPORTS.unlink()
-                else:
-                    MUTE_REPORTS.touch()
-            elif k == ord('o') or k == ord('O'):
-                # Toggle other messages mute
-                if MUTE_OTHER.exists():
-                    MUTE_OTHER.unlink()
-                else:
-                    MUTE_OTHER.touch()
-        except Exception: pass
-        time.sleep(2)
+        if not _handle_key(stdscr.getch()):
+            break
 
 if __name__ == "__main__":
     try:
-        curses.wrapper(main)
+        curses.wrapper(main, "--no-remote" not in sys.argv[1:])
     except KeyboardInterrupt:
         pass
@@ -5,6 +5,11 @@ import tempfile
 from pathlib import Path
 from typing import Any, Union
 
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
 def load_json(path: pathlib.Path, default: Any) -> Any:
     """Load JSON safely.
     If file is missing or invalid JSON, return default.
@@ -12,32 +17,48 @@ def load_json(path: pathlib.Path, default: Any) -> Any:
     try:
         if not path.exists():
             return default
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        data = path.read_bytes()
+        if orjson is not None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN: stdlib json still accepts it
+        return json.loads(data.decode("utf-8"))
     except Exception:
         # Caller handles logging if needed, or we just fail safe to default
         return default
 
-def save_json(path: Union[str, pathlib.Path], obj: Any) -> None:
+def _dumps(obj: Any) -> bytes:
+    """
+    Pretty JSON (indent 2, UTF-8, trailing newline) as bytes. Always stdlib
+    json: orjson would write NaN as null and format some floats differently.
+    """
+    data = json.dumps(obj, ensure_ascii=False, indent=2)
+    if not data.endswith("\n"):
+        data += "\n"
+    return data.encode("utf-8")
+
+def save_json(path: Union[str, pathlib.Path], obj: Any, durable: bool = True) -> None:
     """
     Atomic JSON write.
     Important: temp file MUST be unique (launchd overlap can cause .tmp collisions).
+    durable=False skips the fsync; only for files that are truly cheap to lose
+    (a crash right after the rename can leave them empty).
     """
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    data = json.dumps(obj, ensure_ascii=False, indent=2)
-    if not data.endswith("\n"):
-        data += "\n"
+    data = memoryview(_dumps(obj))
 
     fd = None
     tmp_name = None
     try:
         fd, tmp_name = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            f.write(data)
-            f.flush()
-            os.fsync(f.fileno())
+        while data:
+            data = data[os.write(fd, data):]
+        if durable:
+            os.fsync(fd)
+        os.close(fd)
         fd = None
         os.replace(tmp_name, path)
         tmp_name = None
@@ -1,6 +1,11 @@
+import atexit
+import os
+import queue
+import signal
 import sys
 import threading
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Any
 from .time import TZ_BERLIN
@@ -11,7 +16,10 @@ BOT_LOG_PATH: Optional[Path] = None
 EVENT_LOG_PATH: Optional[Path] = None
 EVENT_STATE_PATH: Optional[Path] = None
 
-_LOG_LOCK = threading.Lock()
+# log_line only formats and enqueues; one daemon thread does the file writes
+_LOG_Q: "queue.SimpleQueue" = queue.SimpleQueue()
+_WRITER: Optional[threading.Thread] = None
+_WRITER_START_LOCK = threading.Lock()
 _EVENT_LAST_BY_KEY = {}
 
 def setup_logging(log_dir: Path, bot_log_name: str = "bot.log") -> None:
@@ -27,16 +35,126 @@ def setup_logging(log_dir: Path, bot_log_name: str = "bot.log") -> None:
     # if it runs for days. But let's assume valid setup.
     pass # Real setup happens in main or we keep it dynamic in log_line
 
+# Timestamp prefix cache. Berlin's UTC offset only changes on a full UTC hour
+# (DST switches at 01:00 UTC), so it is looked up once per hour; the prefix
+# itself has second resolution and is rebuilt once per second.
+_OFFSET = (None, 0, "")   # (utc hour, offset seconds, "+01:00")
+_PREFIX = (None, "")      # (epoch second, prefix)
+
+def _ts_prefix(now: float) -> str:
+    """
+    'YYYY-MM-DD // HH:MM:SS+01:00' in Berlin time for an epoch timestamp.
+    Racing threads at worst compute the same value twice; tuple rebinding is atomic.
+    """
+    global _OFFSET, _PREFIX
+    sec = int(now)
+    if _PREFIX[0] == sec:
+        return _PREFIX[1]
+    hour = sec // 3600
+    if _OFFSET[0] != hour:
+        off = datetime.fromtimestamp(hour * 3600, timezone.utc).astimezone(TZ_BERLIN).utcoffset()
+        off_s = int(off.total_seconds())
+        sign = "-" if off_s < 0 else "+"
+        hh, mm = divmod(abs(off_s) // 60, 60)
+        _OFFSET = (hour, off_s, f"{sign}{hh:02d}:{mm:02d}")
+    prefix = time.strftime("%Y-%m-%d // %H:%M:%S", time.gmtime(sec + _OFFSET[1])) + _OFFSET[2]
+    _PREFIX = (sec, prefix)
+    return prefix
+
+# Long-lived append handles, only touched by the writer thread. A new
+# BOT_LOG_PATH (e.g. date rollover) closes the old handle.
+_LOG_FH = {}
+
+def _close_logs() -> None:
+    for fh in _LOG_FH.values():
+        try:
+            fh.close()
+        except Exception:
+            pass
+    _LOG_FH.clear()
+
 def _append(path: Path, line: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    f = _LOG_FH.get(path)
+    if f is None:
+        _close_logs()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = _LOG_FH[path] = path.open("a", encoding="utf-8")
+    f.write(line + "\n")
+    # Batch writes while records keep coming; flush once the queue is drained
+    if _LOG_Q.empty():
+        f.flush()
+
+def _writer() -> None:
+    while True:
+        item = _LOG_Q.get()
+        if item is None:
+            break
+        if isinstance(item, threading.Event):
+            # Flush barrier: everything queued before it is on disk
+            for fh in _LOG_FH.values():
+                try:
+                    fh.flush()
+                except Exception:
+                    pass
+            item.set()
+            continue
+        try:
+            _append(*item)
+        except Exception:
+            pass
+    _close_logs()
+
+def _ensure_writer() -> None:
+    global _WRITER
+    if _WRITER is not None:
+        return
+    with _WRITER_START_LOCK:
+        if _WRITER is None:
+            _WRITER = threading.Thread(target=_writer, name="log-writer", daemon=True)
+            _WRITER.start()
+            _install_sigterm_drain()
+
+@atexit.register
+def _stop_writer() -> None:
+    """Drain queued lines to disk before the interpreter exits."""
+    if _WRITER is not None and _WRITER.is_alive():
+        _LOG_Q.put(None)
+        _WRITER.join(timeout=5)
 
-def log_line(msg: Any, sep: str = " ") -> None:
+def _flush_queued(timeout: float = 5.0) -> None:
+    """Block until every line queued so far is written and flushed."""
+    if _WRITER is not None and _WRITER.is_alive():
+        done = threading.Event()
+        _LOG_Q.put(done)
+        done.wait(timeout)
+
+def _on_sigterm(signum, frame) -> None:
+    """Drain queued lines, then die of SIGTERM as before."""
+    _stop_writer()
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    os.kill(os.getpid(), signal.SIGTERM)
+
+def _install_sigterm_drain() -> None:
+    """
+    launchd/systemd stop the bot with SIGTERM, which skips atexit. Drain the
+    queue first, unless the application installed its own handler. Only
+    possible from the main thread; ERROR lines are written synchronously anyway.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    try:
+        if signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+            signal.signal(signal.SIGTERM, _on_sigterm)
+    except (ValueError, OSError):
+        pass
+
+def log_line(msg: Any, level: str = "INFO") -> None:
     """
     Logging wrapper (single timestamp, readable):
     - Prefix every line with: YYYY-MM-DD // HH:MM:SS -
     - No ISO 'T' and no '+01:00' noise.
+    - level "ERROR" waits until the line is on disk, so the error explaining
+      a crash or kill is never left in the queue.
     """
     global BOT_LOG_PATH
     
@@ -46,18 +164,17 @@ def log_line(msg: Any, sep: str = " ") -> None:
     
     line = str(msg).strip()
     
-    with _LOG_LOCK:
-        ts = datetime.now(TZ_BERLIN)
-        prefix = ts.strftime("%Y-%m-%d // %H:%M:%S%z")
-        if len(prefix) >= 5:
-            prefix = prefix[:-2] + ":" + prefix[-2:]
-        
-        full = f"{prefix} - {line}" if line else f"{prefix} -"
-        
-        if BOT_LOG_PATH:
-             _append(BOT_LOG_PATH, full)
-        
-        print(full, flush=True)
+    prefix = _ts_prefix(time.time())
+
+    full = f"{prefix} - {line}" if line else f"{prefix} -"
+
+    if BOT_LOG_PATH:
+        _ensure_writer()
+        _LOG_Q.put((BOT_LOG_PATH, full))
+        if level == "ERROR":
+            _flush_queued()
+
+    print(full, flush=True)
 
 # Note: The complex event dedup logic from bot.py (fav_check etc) 
 # might belong better in the Domain layer or a specific adapter wrapper, 
@@ -1,18 +1,33 @@
-from datetime import datetime, timezone
+import time
+from datetime import datetime
 from zoneinfo import ZoneInfo
 from typing import Optional
 
 TZ_BERLIN = ZoneInfo("Europe/Berlin")
+_now = datetime.now
 
 def now_berlin() -> datetime:
-    return datetime.now(TZ_BERLIN)
+    return _now(TZ_BERLIN)
+
+# (epoch second, formatted) - both formats have second resolution, so calls
+# within the same second reuse the string. Rebinding a tuple is thread-safe.
+_NOW_ISO = (None, "")
+_TODAY_ISO = (None, "")
 
 def now_iso() -> str:
     """Local time, human readable (no 'T', no timezone suffix)."""
-    return datetime.now().strftime("%Y-%m-%d // %H:%M:%S")
+    global _NOW_ISO
+    sec = int(time.time())
+    if _NOW_ISO[0] != sec:
+        _NOW_ISO = (sec, time.strftime("%Y-%m-%d // %H:%M:%S", time.localtime(sec)))
+    return _NOW_ISO[1]
 
 def today_iso() -> str:
-    return datetime.now(timezone.utc).date().isoformat()
+    global _TODAY_ISO
+    sec = int(time.time())
+    if _TODAY_ISO[0] != sec:
+        _TODAY_ISO = (sec, time.strftime("%Y-%m-%d", time.gmtime(sec)))
+    return _TODAY_ISO[1]
 
 def iso_date_from_created_at(created_at: Optional[str]) -> str:
     if not created_at:
@@ -0,0 +1,15 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+
+@pytest.fixture
+def make_feature():
+    """Factory for a GeoJSON point feature with the given properties."""
+    def _make(**props):
+        return {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [13.4, 52.5]},
+            "properties": props,
+        }
+    return _make
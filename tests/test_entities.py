@@ -161,9 +161,30 @@ class TestEntityMatching:
         registry = EntityRegistry(data)
         
         entity_key, entity_display = registry.match_entity_from_type("testing123")
-        
+
         assert entity_key == "test"
 
+    def test_longest_key_wins_at_same_position(self):
+        """A longer key sharing a prefix beats the shorter one."""
+        data = {
+            "afd": {"display": "AfD"},
+            "afd-jugend": {"display": "AfD-Jugend"}
+        }
+        registry = EntityRegistry(data)
+
+        assert registry.match_entity_from_type("AfD-Jugend sticker") == ("afd-jugend", "AfD-Jugend")
+        assert registry.match_entity_from_type("AfD sticker") == ("afd", "AfD")
+
+    def test_earliest_match_in_text_wins(self):
+        """The key appearing first in the text is returned."""
+        data = {
+            "NPD": {"display": "NPD"},
+            "AFD": {"display": "AfD"}
+        }
+        registry = EntityRegistry(data)
+
+        assert registry.match_entity_from_type("AFD and NPD") == ("AFD", "AfD")
+
 
 class TestEntityRegistryWithRealData:
     """Integration tests with realistic entity data."""
@@ -0,0 +1,80 @@
+"""
+Tests for files.py - JSON load/save helpers.
+
+These tests verify:
+- save_json round-trips through load_json
+- save_json formats floats (and NaN) exactly like stdlib json
+- load_json accepts what stdlib json accepts and defaults on bad input
+- save_json leaves no temp files behind
+- fsync is skipped only for non-durable writes
+"""
+
+import json
+from unittest.mock import patch
+from hm.utils.files import load_json, save_json
+
+
+class TestSaveJson:
+    """Tests for atomic JSON writes."""
+
+    def test_round_trip(self, tmp_path):
+        """Saved data loads back unchanged, pretty-printed with a trailing newline."""
+        path = tmp_path / "data.json"
+        obj = {"name": "Straße", "items": [1, 2.5, None], "nested": {}}
+
+        save_json(path, obj)
+
+        assert load_json(path, None) == obj
+        text = path.read_text(encoding="utf-8")
+        assert text == json.dumps(obj, ensure_ascii=False, indent=2) + "\n"
+
+    def test_floats_written_like_stdlib_json(self, tmp_path):
+        """Exponent floats and NaN are written exactly as stdlib json writes them."""
+        path = tmp_path / "data.json"
+        obj = {"tiny": 1e-05, "huge": 1e16, "nan": float("nan")}
+
+        save_json(path, obj)
+
+        text = path.read_text(encoding="utf-8")
+        assert text == json.dumps(obj, ensure_ascii=False, indent=2) + "\n"
+        assert '"nan": NaN' in text
+
+    def test_no_temp_files_left(self, tmp_path):
+        """Only the target file remains after a write."""
+        path = tmp_path / "data.json"
+
+        save_json(path, [1, 2, 3])
+
+        assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+    def test_durable_write_fsyncs(self, tmp_path):
+        """Default writes are fsynced before the rename."""
+        with patch("hm.utils.files.os.fsync") as fsync:
+            save_json(tmp_path / "data.json", {})
+        assert fsync.called
+
+    def test_non_durable_write_skips_fsync(self, tmp_path):
+        """durable=False skips the fsync."""
+        with patch("hm.utils.files.os.fsync") as fsync:
+            save_json(tmp_path / "data.json", {}, durable=False)
+        assert not fsync.called
+
+
+class TestLoadJson:
+    """Tests for JSON loads."""
+
+    def test_nan_falls_back_to_stdlib(self, tmp_path):
+        """Values only stdlib json parses (NaN) still load."""
+        path = tmp_path / "data.json"
+        path.write_text('{"x": NaN, "y": 1}', encoding="utf-8")
+
+        data = load_json(path, None)
+
+        assert data["x"] != data["x"] and data["y"] == 1
+
+    def test_invalid_or_missing_returns_default(self, tmp_path):
+        """Broken or absent files return the default."""
+        path = tmp_path / "data.json"
+        assert load_json(path, {"d": 1}) == {"d": 1}
+        path.write_text("{not json", encoding="utf-8")
+        assert load_json(path, []) == []
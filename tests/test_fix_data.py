@@ -0,0 +1,82 @@
+"""
+Tests for tools/fix_data.py - the reports.geojson writers.
+
+These tests verify:
+- save_reports writes json.dumps(indent=2, ensure_ascii=False) plus a newline
+- a failed write leaves the original file in place and no temp file behind
+- save_reports_ndjson writes one compact member line, then one feature per line
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "fix_data", Path(__file__).resolve().parent.parent / "tools" / "fix_data.py"
+)
+fix_data = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(fix_data)
+
+
+class TestSaveReports:
+    """Tests for the streamed indent=2 writer."""
+
+    def test_layout_matches_stdlib_json(self, tmp_path, make_feature):
+        """Output is json.dumps(indent=2, ensure_ascii=False) of the whole collection plus a newline."""
+        path = tmp_path / "reports.geojson"
+        head = {"type": "FeatureCollection", "name": "Straße"}
+        features = [
+            make_feature(lat=52.5, lon=13.4, tiny=1e-05, huge=1e20, note="Straße", empty={}, items=[]),
+            make_feature(lat=-0.0, lon=180.0, count=3, ok=True, gone=None),
+        ]
+        tail = {"crs": {"type": "name"}}
+
+        fix_data.save_reports(path, head, iter(features), tail)
+
+        expected = json.dumps({**head, "features": features, **tail}, ensure_ascii=False, indent=2) + "\n"
+        assert path.read_text(encoding="utf-8") == expected
+
+    def test_empty_features(self, tmp_path):
+        """An empty collection is laid out like json.dumps too."""
+        path = tmp_path / "reports.geojson"
+
+        fix_data.save_reports(path, {"type": "FeatureCollection"}, iter([]), {})
+
+        expected = json.dumps({"type": "FeatureCollection", "features": []}, indent=2) + "\n"
+        assert path.read_text(encoding="utf-8") == expected
+
+    def test_failure_keeps_original(self, tmp_path, make_feature):
+        """If the features fail mid-write, the original and backup are untouched and no tmp file remains."""
+        path = tmp_path / "reports.geojson"
+        path.write_text("original", encoding="utf-8")
+        backup = tmp_path / "reports.geojson.backup"
+
+        def features():
+            yield make_feature(lat=1.0, lon=2.0)
+            raise ValueError("bad feature")
+
+        with pytest.raises(ValueError):
+            fix_data.save_reports(path, {"type": "FeatureCollection"}, features(), {}, backup)
+
+        assert path.read_text(encoding="utf-8") == "original"
+        assert not backup.exists()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["reports.geojson"]
+
+
+class TestSaveReportsNdjson:
+    """Tests for the newline-delimited writer."""
+
+    def test_one_feature_per_line(self, tmp_path, make_feature):
+        """First line holds the other members, then one compact feature per line."""
+        path = tmp_path / "reports.geojson.seq"
+        features = [make_feature(lat=1.0, lon=2.0, tiny=1e-05), make_feature(lat=3.0, lon=4.0, note="Straße")]
+
+        fix_data.save_reports_ndjson(path, {"type": "FeatureCollection"}, iter(features), {"name": "x"})
+
+        lines = path.read_text(encoding="utf-8").split("\n")
+        assert lines[-1] == ""
+        assert json.loads(lines[0]) == {"type": "FeatureCollection", "name": "x"}
+        assert [json.loads(l) for l in lines[1:-1]] == features
+        assert lines[1] == json.dumps(features[0], ensure_ascii=False, separators=(",", ":"))
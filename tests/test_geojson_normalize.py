@@ -0,0 +1,107 @@
+"""
+Tests for geojson_normalize.py - In-place normalization of reports.geojson.
+
+These tests verify:
+- Entity fields are filled only for verified keys
+- Unknown keys stay "Unknown"
+- Already-normalized features are skipped until their inputs or outputs change
+"""
+
+import json
+import pytest
+from hm.domain.geojson_normalize import normalize_reports_geojson
+
+
+@pytest.fixture
+def entities_path(tmp_path):
+    path = tmp_path / "entities.json"
+    path.write_text(json.dumps({"afd": {"display": "AfD", "desc": "Far-right party"}}), encoding="utf-8")
+    return path
+
+
+class TestNormalizeEntities:
+    """Tests for entity field normalization."""
+
+    def test_verified_key_fills_entity_fields(self, entities_path, make_feature):
+        """A sticker_type matching entities.json populates display/desc/category."""
+        reports = {"features": [make_feature(sticker_type="AfD", first_seen="2026-01-24")]}
+
+        normalize_reports_geojson(reports, entities_path)
+
+        p = reports["features"][0]["properties"]
+        assert p["entity_key"] == "afd"
+        assert p["entity_display"] == "AfD"
+        assert p["category"] == "afd"
+        assert p["needs_verification"] is False
+        assert p["first_seen_ym"] == "2026-01"
+
+    def test_mixed_case_key_matches_case_insensitively(self, tmp_path, make_feature):
+        """A sticker_type matches an entities.json key regardless of case."""
+        path = tmp_path / "entities.json"
+        path.write_text(json.dumps({"AfD-Jugend": {"display": "AfD-Jugend"}}), encoding="utf-8")
+        reports = {"features": [make_feature(sticker_type="AFD-JUGEND")]}
+
+        normalize_reports_geojson(reports, path)
+
+        assert reports["features"][0]["properties"]["entity_key"] == "AfD-Jugend"
+
+    def test_unknown_key_stays_unknown(self, entities_path, make_feature):
+        """Unverified keys are never interpreted."""
+        reports = {"features": [make_feature(sticker_type="mystery")]}
+
+        normalize_reports_geojson(reports, entities_path)
+
+        p = reports["features"][0]["properties"]
+        assert p["entity_display"] == "Unknown"
+        assert p["needs_verification"] is True
+
+
+class TestNormalizeIdempotency:
+    """Tests for the `_norm_sig` skip marker."""
+
+    def test_stamps_features(self, entities_path, make_feature):
+        """Normalized features carry a stamp."""
+        reports = {"features": [make_feature(sticker_type="AfD")]}
+
+        normalize_reports_geojson(reports, entities_path)
+
+        assert reports["features"][0]["properties"]["_norm_sig"]
+
+    def test_skips_stamped_feature(self, entities_path, make_feature):
+        """An untouched stamped feature is not redone."""
+        reports = {"features": [make_feature(sticker_type="AfD")]}
+        normalize_reports_geojson(reports, entities_path)
+        sig = reports["features"][0]["properties"]["_norm_sig"]
+
+        assert normalize_reports_geojson(reports, entities_path) == 0
+        assert reports["features"][0]["properties"]["_norm_sig"] == sig
+
+    def test_output_drift_renormalizes(self, entities_path, make_feature):
+        """An edited output field (e.g. by hand or another tool) is repaired on the next pass."""
+        reports = {"features": [make_feature(sticker_type="AfD")]}
+        normalize_reports_geojson(reports, entities_path)
+        p = reports["features"][0]["properties"]
+        p["entity_display"] = "edited"
+        p["needs_verification"] = None
+
+        assert normalize_reports_geojson(reports, entities_path) == 1
+        assert p["entity_display"] == "AfD"
+        assert p["needs_verification"] is False
+
+    def test_returns_modified_count(self, entities_path, make_feature):
+        """The return value counts (re)normalized features; a no-op pass returns 0."""
+        reports = {"features": [make_feature(sticker_type="AfD"), make_feature(sticker_type="x")]}
+
+        assert normalize_reports_geojson(reports, entities_path) == 2
+        assert normalize_reports_geojson(reports, entities_path) == 0
+
+    def test_input_change_renormalizes(self, entities_path, make_feature):
+        """Changing an input field (e.g. last_seen after a dedup merge) redoes the feature."""
+        reports = {"features": [make_feature(sticker_type="AfD", first_seen="2026-01-24")]}
+        normalize_reports_geojson(reports, entities_path)
+        p = reports["features"][0]["properties"]
+        p["last_seen"] = "2026-03-02"
+
+        normalize_reports_geojson(reports, entities_path)
+
+        assert p["last_seen_ym"] == "2026-03"
@@ -6,6 +6,7 @@ These tests verify:
 - Polyline nearest point calculation
 - Geocoding (with mocked Nominatim API)
 - Location snapping (with mocked Overpass API)
+- Overpass response caching
 """
 
 import pytest
@@ -17,8 +18,11 @@ from hm.domain.location import (
     _nearest_point_on_polyline_m,
     geocode_nominatim,
     geocode_query_worldwide,
-    snap_to_public_way
+    snap_to_public_way,
+    _overpass_post,
+    clear_overpass_cache
 )
+from hm.core.constants import OVERPASS_CACHE_TTL_S
 
 
 class TestCoordinateProjection:
@@ -101,7 +105,7 @@ class TestNearestPointOnPolyline:
 class TestGeocodingNominatim:
     """Tests for Nominatim geocoding (mocked API)."""
     
-    @patch('hm.domain.location.requests.get')
+    @patch('hm.domain.location._SESSION.get')
     def test_successful_geocode(self, mock_get):
         """Successful geocoding returns coordinates."""
         mock_response = Mock()
@@ -116,7 +120,7 @@ class TestGeocodingNominatim:
         assert result == (52.5200, 13.4050)
         mock_get.assert_called_once()
     
-    @patch('hm.domain.location.requests.get')
+    @patch('hm.domain.location._SESSION.get')
     def test_no_results_returns_none(self, mock_get):
         """No results from Nominatim returns None."""
         mock_response = Mock()
@@ -128,7 +132,7 @@ class TestGeocodingNominatim:
         
         assert result is None
     
-    @patch('hm.domain.location.requests.get')
+    @patch('hm.domain.location._SESSION.get')
     def test_api_error_returns_none(self, mock_get):
         """API errors return None gracefully."""
         mock_get.side_effect = Exception("Network error")
@@ -179,7 +183,7 @@ class TestSnapToPublicWay:
     @patch('hm.domain.location._overpass_post')
     def test_snaps_to_poi(self, mock_overpass):
         """Prefers POI (bench) over ways."""
-        # First call: POI query - return a bench
+        # First call: POI + highway query - a bench and a road
         # Second call: building check - no building
         mock_overpass.side_effect = [
             {
@@ -188,6 +192,13 @@ class TestSnapToPublicWay:
                     "lat": 52.5001,
                     "lon": 13.4001,
                     "tags": {"leisure": "bench"}
+                }, {
+                    "type": "way",
+                    "tags": {"highway": "residential"},
+                    "geometry": [
+                        {"lat": 52.5, "lon": 13.4},
+                        {"lat": 52.5, "lon": 13.41}
+                    ]
                 }]
             },
             {"elements": []}  # No building nearby
@@ -202,10 +213,9 @@ class TestSnapToPublicWay:
     @patch('hm.domain.location._overpass_post')
     def test_snaps_to_footway(self, mock_overpass):
         """Snaps to footway when no POI found."""
-        # Mock responses: no POIs, then highway ways
+        # Mock responses: POI + highway query with only a footway
         mock_overpass.side_effect = [
-            {"elements": []},  # No POIs
-            {  # Highway query - footway
+            {  # No POIs, one footway
                 "elements": [{
                     "type": "way",
                     "tags": {"highway": "footway"},
@@ -224,13 +234,14 @@ class TestSnapToPublicWay:
         assert abs(lat - 52.5) < 0.001  # Near the footway
         assert 13.4 < lon < 13.41
         assert "snap_walk:footway" in note
+        # POIs and highways share one request; the second is the building check
+        assert mock_overpass.call_count == 2
     
     @patch('hm.domain.location._overpass_post')
     def test_filters_private_ways(self, mock_overpass):
         """Filters out private ways (access=private)."""
         mock_overpass.side_effect = [
-            {"elements": []},  # No POIs
-            {  # Highway query - private driveway
+            {  # No POIs, only a private driveway
                 "elements": [{
                     "type": "way",
                     "tags": {
@@ -269,3 +280,54 @@ class TestHaversineDistance:
         # Approximate coordinates
         dist = haversine_m(52.5163, 13.3777, 52.5186, 13.3761)
         assert 200 < dist < 400  # ~300m
+
+
+class TestOverpassCache:
+    """Tests for the in-process Overpass response cache."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        clear_overpass_cache()
+        yield
+        clear_overpass_cache()
+
+    @patch('hm.domain.location._SESSION.post')
+    def test_repeat_query_hits_cache(self, mock_post):
+        """Identical queries (modulo whitespace) only go out once."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"elements": [{"type": "node"}]}
+        mock_post.return_value = mock_response
+
+        first = _overpass_post("[out:json];\nnode(1);\nout;", "TestAgent")
+        second = _overpass_post("[out:json];  node(1);   out;", "TestAgent")
+
+        assert first == second == {"elements": [{"type": "node"}]}
+        mock_post.assert_called_once()
+
+    @patch('hm.domain.location._SESSION.post')
+    def test_expired_entry_is_refetched(self, mock_post):
+        """An answer older than OVERPASS_CACHE_TTL_S is fetched again."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"elements": []}
+        mock_post.return_value = mock_response
+
+        with patch('hm.domain.location.time.monotonic', return_value=1000.0):
+            _overpass_post("node(1);", "TestAgent")
+        with patch('hm.domain.location.time.monotonic', return_value=1000.0 + OVERPASS_CACHE_TTL_S - 1):
+            _overpass_post("node(1);", "TestAgent")
+        assert mock_post.call_count == 1
+        with patch('hm.domain.location.time.monotonic', return_value=1000.0 + OVERPASS_CACHE_TTL_S):
+            _overpass_post("node(1);", "TestAgent")
+        assert mock_post.call_count == 2
+
+    @patch('hm.domain.location._SESSION.post')
+    def test_failures_are_not_cached(self, mock_post):
+        """A query that failed on every endpoint is retried next time."""
+        mock_post.side_effect = Exception("Network error")
+
+        assert _overpass_post("node(1);", "TestAgent") is None
+        calls = mock_post.call_count
+        assert _overpass_post("node(1);", "TestAgent") is None
+        assert mock_post.call_count == 2 * calls
@@ -0,0 +1,44 @@
+"""
+Tests for log.py - queued log file writes.
+
+These tests verify:
+- ERROR lines are on disk when log_line returns, with everything queued before them
+- the SIGTERM drain is only installed over the default handler
+"""
+
+import signal
+
+from hm.utils import log
+
+
+class TestLogLine:
+    """Tests for the queue-fed log writer."""
+
+    def test_error_line_written_synchronously(self, tmp_path, monkeypatch):
+        """An ERROR line and all lines before it are flushed before log_line returns."""
+        path = tmp_path / "bot.log"
+        monkeypatch.setattr(log, "BOT_LOG_PATH", path)
+
+        for i in range(500):
+            log.log_line(f"line {i}")
+        log.log_line("BOOM", "ERROR")
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 501
+        assert lines[-1].endswith(" - BOOM")
+
+    def test_sigterm_drain_respects_existing_handler(self):
+        """An application's own SIGTERM handler is left in place."""
+        def own(signum, frame):
+            pass
+
+        previous = signal.signal(signal.SIGTERM, own)
+        try:
+            log._install_sigterm_drain()
+            assert signal.getsignal(signal.SIGTERM) is own
+
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            log._install_sigterm_drain()
+            assert signal.getsignal(signal.SIGTERM) == log._on_sigterm
+        finally:
+            signal.signal(signal.SIGTERM, previous)
@@ -15,7 +15,8 @@ from hm.domain.parse_post import (
     parse_type_and_medium,
     parse_note,
     has_image,
-    normalize_location_line
+    normalize_location_line,
+    _parse_dms
 )
 from hm.core.models import Kind
 
@@ -43,6 +44,10 @@ class TestStripHtml:
         assert strip_html("") == ""
         assert strip_html(None) == ""
 
+    def test_literal_lt_before_break_keeps_text(self):
+        """A stray "<" before a break must not swallow the break and the text after it."""
+        assert strip_html("r< / Str,</p>W&") == "r< / Str,\nW&"
+
 
 class TestParseLocation:
     """Tests for location parsing from post content."""
@@ -90,6 +95,30 @@ class TestParseLocation:
         assert coords is None
         assert query is None
 
+    def test_long_text_is_not_truncated(self):
+        """Locations past the cache key limit are still found."""
+        text = "#sticker_report\n" + "#filler\n" * 600 + "Potsdamer Platz, Berlin"
+        coords, query = parse_location(text)
+        assert query == "Potsdamer Platz, Berlin"
+
+
+class TestParseDms:
+    """Tests for DMS (degrees/minutes/seconds) coordinate parsing."""
+    
+    def test_parses_google_maps_dms(self):
+        lat, lon = _parse_dms("52°31'12\"N 13°24'18\"E")
+        assert abs(lat - 52.52) < 0.0001
+        assert abs(lon - 13.405) < 0.0001
+    
+    def test_south_west_are_negative(self):
+        lat, lon = _parse_dms("34°36'13,3\"S 58°22'54\"W")
+        assert lat < 0
+        assert lon < 0
+    
+    def test_single_axis_returns_none(self):
+        assert _parse_dms("52°31'12\"N") is None
+        assert _parse_dms("no coordinates") is None
+
 
 class TestParseTypeAndMedium:
     """Tests for sticker/graffiti type parsing."""
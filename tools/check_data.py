@@ -16,48 +16,87 @@ status if issues are found.
 Usage:
     python tools/check_data.py --reports reports.geojson --entities entities.json
 """
-import argparse, json, sys
+import argparse, json, math, sys
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
 def load_json(path: Path) -> dict:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        data = path.read_bytes()
+        if orjson is not None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(data.decode("utf-8"))
     except FileNotFoundError:
         raise SystemExit(f"File not found: {path}")
 
+REQUIRED_FIELDS = ("status", "sticker_type", "category", "first_seen", "last_seen")
+# (field, error tag) pairs, built once instead of formatting tags per report
+_REQUIRED_TAGS = tuple((field, f"missing_{field}") for field in REQUIRED_FIELDS)
+# All required values in one C-level call; the per-field loop only runs when something is missing
+_required_values = itemgetter(*REQUIRED_FIELDS)
+_NEIGHBOUR_CELLS = tuple((dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1))
+
 def check_reports(reports: dict, entities: dict) -> list[tuple[str, str]]:
     errors: list[tuple[str, str]] = []
     seen_urls: set[str] = set()
-    seen_coords: list[tuple[float, float, str]] = []
+    # Seen coordinates bucketed on a 1e-4 degree grid (the duplicate
+    # tolerance), so each point is only compared against its 3x3 neighbourhood
+    seen_coords: dict[tuple[int, int], list[tuple[float, float, str]]] = {}
     features = reports.get("features", [])
+    add = errors.append
+    # Raw entity_key/sticker_type value -> entities entry. Many reports share a
+    # key, so each distinct value is stripped and looked up only once.
+    ent_by_raw: dict = {}
+    isfinite, floor = math.isfinite, math.floor
     for feat in features:
         props = feat.get("properties", {})
-        report_id = props.get("id") or "unknown"
-        sticker_type = str(props.get("entity_key") or props.get("sticker_type") or "").strip()
-        ent = entities.get(sticker_type)
-        if ent and (not props.get("entity_display") or not props.get("entity_desc")):
-            errors.append(("missing_description", report_id))
-        lat = props.get("lat")
-        lon = props.get("lon")
+        get = props.get
+        report_id = get("id") or "unknown"
+        raw = get("entity_key") or get("sticker_type") or ""
+        if isinstance(raw, str):
+            try:
+                ent = ent_by_raw[raw]
+            except KeyError:
+                ent = ent_by_raw[raw] = entities.get(raw.strip())
+        else:
+            ent = entities.get(str(raw).strip())
+        if ent and (not get("entity_display") or not get("entity_desc")):
+            add(("missing_description", report_id))
+        lat = get("lat")
+        lon = get("lon")
         if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
-            errors.append(("invalid_coordinates", report_id))
+            add(("invalid_coordinates", report_id))
         else:
             if not (-90 <= lat <= 90 and -180 <= lon <= 180):
-                errors.append(("out_of_bounds_coordinates", report_id))
-            for prev_lat, prev_lon, _ in seen_coords:
-                if abs(lat - prev_lat) < 1e-4 and abs(lon - prev_lon) < 1e-4:
-                    errors.append(("duplicate_coordinates", report_id))
-            seen_coords.append((lat, lon, report_id))
-        url = str(props.get("url") or "").strip()
+                add(("out_of_bounds_coordinates", report_id))
+            if isfinite(lat) and isfinite(lon):
+                cy, cx = floor(lat * 1e4), floor(lon * 1e4)
+                for dy, dx in _NEIGHBOUR_CELLS:
+                    for prev_lat, prev_lon, _ in seen_coords.get((cy + dy, cx + dx), ()):
+                        if abs(lat - prev_lat) < 1e-4 and abs(lon - prev_lon) < 1e-4:
+                            add(("duplicate_coordinates", report_id))
+                seen_coords.setdefault((cy, cx), []).append((lat, lon, report_id))
+        url = str(get("url") or "").strip()
         if url:
             if url in seen_urls:
-                errors.append(("duplicate_url", report_id))
+                add(("duplicate_url", report_id))
             seen_urls.add(url)
-        required_fields = ["status", "sticker_type", "category", "first_seen", "last_seen"]
-        for field in required_fields:
-            if not props.get(field):
-                errors.append((f"missing_{field}", report_id))
+        try:
+            complete = all(_required_values(props))
+        except KeyError:
+            complete = False
+        if not complete:
+            for field, tag in _REQUIRED_TAGS:
+                if not get(field):
+                    add((tag, report_id))
     return errors
 
 def main() -> int:
@@ -70,8 +109,8 @@ def main() -> int:
     errors = check_reports(reports, entities)
     if errors:
         for issue, rid in errors:
-            print(f"{issue}\\t{rid}")
-        print(f"\\nFound {len(errors)} issues")
+            print(f"{issue}\t{rid}")
+        print(f"\nFound {len(errors)} issues")
         return 1
     else:
         print("No issues detected")
@@ -1,13 +1,38 @@
 #!/usr/bin/env python3
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root to path
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
-from hm.domain.enrichment import enrich_entity
-from hm.utils.files import load_json
+from hm.domain.enrichment import entity_desc_from_sources, load_sources_map
+from hm.utils.files import load_json, save_json
+
+# Parallel Wikipedia fetches. Workers overlap request latency, while lookups
+# still start at most once per MIN_INTERVAL_S so the API sees a polite rate.
+MAX_WORKERS = 6
+MIN_INTERVAL_S = 0.2
+
+_RATE_LOCK = threading.Lock()
+_next_start = 0.0
+
+def _throttle() -> None:
+    """Block until this worker may start its next lookup."""
+    global _next_start
+    with _RATE_LOCK:
+        now = time.monotonic()
+        wait = _next_start - now
+        _next_start = max(now, _next_start) + MIN_INTERVAL_S
+    if wait > 0:
+        time.sleep(wait)
+
+def _fetch_desc(ent, sources_map) -> str:
+    _throttle()
+    return entity_desc_from_sources(ent, sources_map)
 
 def main():
     entities_path = ROOT / "entities.json"
@@ -15,17 +40,29 @@ def main():
     
     print("Loading entities...")
     entities = load_json(entities_path, {})
+    sources_map = load_sources_map(sources_path)
     
     print(f"Found {len(entities)} entities. Starting enrichment...")
-    
-    updated_count = 0
-    for key in entities:
-        print(f"Enriching '{key}'...")
-        if enrich_entity(key, entities_path, sources_path):
-            print(f"  -> UPDATED {key}")
-            updated_count += 1
-        else:
-            print(f"  -> no change or no source")
+
+    # Fetch concurrently, then apply and save once: no per-entity rewrite of
+    # entities.json, and no read-modify-write races between workers.
+    keys = [k for k, ent in entities.items() if ent]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        descs = pool.map(lambda k: _fetch_desc(entities[k], sources_map), keys)
+
+        updated_count = 0
+        for key, new_desc in zip(keys, descs):
+            print(f"Enriching '{key}'...")
+            ent = entities[key]
+            if new_desc and new_desc != ent.get("desc"):
+                ent["desc"] = new_desc
+                print(f"  -> UPDATED {key}")
+                updated_count += 1
+            else:
+                print(f"  -> no change or no source")
+
+    if updated_count:
+        save_json(entities_path, entities)
             
     print(f"Done. Updated {updated_count} entities.")
 
@@ -1,21 +1,98 @@
 #!/usr/bin/env python3
-import json, sys, subprocess, urllib.parse
+import functools, json, sys, time, urllib.parse
 from pathlib import Path
 
-def _curl_json(url: str, timeout_s: int = 15) -> dict:
-    cmd = ["curl", "-fsSL", "--max-time", str(int(timeout_s)), url]
-    r = subprocess.run(cmd, capture_output=True, text=True)
-    if r.returncode != 0:
-        return {}
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from hm.utils.files import save_json
+
+try:
+    import orjson
+except ImportError:  # optional: faster entities.json decode
+    orjson = None
+
+def _make_session() -> requests.Session:
+    """Keep-alive session for the Wikipedia/Wikidata lookups, retrying 429/5xx."""
+    s = requests.Session()
+    s.headers["User-Agent"] = "HeatmapOfFascismBot/1.0.0 (Research)"
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504), raise_on_status=False)
+    s.mount("https://", HTTPAdapter(pool_maxsize=8, max_retries=retry))
+    return s
+
+_SESSION = _make_session()
+
+class _LookupUnavailable(ValueError):
+    """The API could not answer (network error, 429/5xx, garbled body); retry later."""
+
+def _get_json(url: str, timeout_s: int = 15) -> dict:
+    """
+    GET url as JSON. Other 4xx (e.g. 404 for a missing entity) is a real
+    answer and gives {}; transport failures raise _LookupUnavailable.
+    """
     try:
-        return json.loads(r.stdout)
-    except Exception:
+        r = _SESSION.get(url, timeout=timeout_s)
+    except requests.RequestException as e:
+        raise _LookupUnavailable(f"request failed: {e.__class__.__name__}") from e
+    if r.status_code == 429 or r.status_code >= 500:
+        raise _LookupUnavailable(f"HTTP {r.status_code}")
+    if r.status_code >= 400:
         return {}
+    try:
+        return r.json()
+    except ValueError as e:
+        raise _LookupUnavailable("response is not JSON") from e
+
+# Persistent lookup cache across runs: "<fn>|<args>" -> {"v": result, "ts": epoch}.
+# Hits are kept for 30 days; empty results only for a day so dead lookups retry.
+# A _LookupUnavailable propagates without touching the cache.
+CACHE_PATH = Path("cache_wikidata.json")
+CACHE_TTL_S = 30 * 86400
+CACHE_MISS_TTL_S = 86400
+_cache = None
+_cache_dirty = False
+
+def _load_cache() -> dict:
+    global _cache
+    if _cache is None:
+        try:
+            _cache = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+        except Exception:
+            _cache = {}
+    return _cache
+
+def _disk_cached(fn):
+    @functools.wraps(fn)
+    def wrapper(*args: str) -> str:
+        global _cache_dirty
+        cache = _load_cache()
+        key = "|".join((fn.__name__,) + args)
+        hit = cache.get(key)
+        now = time.time()
+        if isinstance(hit, dict):
+            ttl = CACHE_TTL_S if hit.get("v") else CACHE_MISS_TTL_S
+            if now - float(hit.get("ts") or 0) < ttl:
+                return hit.get("v") or ""
+        v = fn(*args)
+        cache[key] = {"v": v, "ts": int(now)}
+        _cache_dirty = True
+        return v
+    return wrapper
+
+def _save_cache() -> None:
+    if _cache_dirty:
+        save_json(CACHE_PATH, _cache, durable=False)  # lookup cache only; safe to lose
 
+@_disk_cached
 def _qid_from_wikipedia(wiki_lang: str, title: str) -> str:
     q = urllib.parse.quote(title)
     url = f"https://{wiki_lang}.wikipedia.org/w/api.php?action=query&format=json&prop=pageprops&ppprop=wikibase_item&titles={q}"
-    data = _curl_json(url, timeout_s=15)
+    data = _get_json(url, timeout_s=15)
     pages = ((data or {}).get("query") or {}).get("pages") or {}
     for _pid, p in pages.items():
         pp = (p or {}).get("pageprops") or {}
@@ -24,27 +101,18 @@ def _qid_from_wikipedia(wiki_lang: str, title: str) -> str:
             return qid
     return ""
 
+@_disk_cached
 def _en_desc_from_qid(qid: str) -> str:
     url = f"https://www.wikidata.org/wiki/Special:EntityData/{qid}.json"
-    data = _curl_json(url, timeout_s=15)
+    data = _get_json(url, timeout_s=15)
     ent = ((data or {}).get("entities") or {}).get(qid) or {}
     desc = (((ent.get("descriptions") or {}).get("en") or {}).get("value") or "").strip()
     if len(desc) > 240:
         desc = desc[:237].rstrip() + "…"
     return desc
 
-def main():
-    if len(sys.argv) < 2:
-        print("USAGE: tools/entity_enrich.py <entity_key>")
-        raise SystemExit(2)
-
-    key = sys.argv[1].strip().lower()
-    p = Path("entities.json")
-    ent = json.loads(p.read_text(encoding="utf-8"))
-    if key not in ent:
-        raise SystemExit(f"ERROR: key not found: {key}")
-
-    e = ent[key] if isinstance(ent[key], dict) else {}
+def _resolve(e: dict) -> tuple:
+    """(qid, desc) for one entity; raises ValueError with the reason on failure."""
     # Prefer explicitly stored QID if you ever add it manually.
     qid = (e.get("qid") or "").strip()
 
@@ -59,17 +127,46 @@ def main():
             qid = _qid_from_wikipedia(wiki_lang, title)
 
     if not qid:
-        raise SystemExit("ERROR: no qid and no wiki_(en|de) title to resolve qid")
+        raise ValueError("no qid and no wiki_(en|de) title to resolve qid")
 
     desc = _en_desc_from_qid(qid)
     if not desc:
-        raise SystemExit("ERROR: empty EN description for qid")
+        raise ValueError("empty EN description for qid")
+    return qid, desc
+
+def main():
+    if len(sys.argv) < 2:
+        print("USAGE: tools/entity_enrich.py <entity_key> [<entity_key> ...]")
+        raise SystemExit(2)
+
+    keys = [k.strip().lower() for k in sys.argv[1:]]
+    p = Path("entities.json")
+    ent = orjson.loads(p.read_bytes()) if orjson is not None else json.loads(p.read_text(encoding="utf-8"))
+
+    # Resolve every key first, then write entities.json once
+    errors = []
+    updated = 0
+    for key in keys:
+        if key not in ent:
+            errors.append(f"ERROR: key not found: {key}")
+            continue
+        e = ent[key] if isinstance(ent[key], dict) else {}
+        try:
+            qid, desc = _resolve(e)
+        except ValueError as exc:
+            errors.append(f"ERROR: {key}: {exc}" if len(keys) > 1 else f"ERROR: {exc}")
+            continue
+        e["qid"] = qid
+        e["desc"] = desc
+        ent[key] = e
+        updated += 1
+        print(f"OK: enriched {key} qid={qid} desc_len={len(desc)} source=wikidata_via_wikipedia")
 
-    e["qid"] = qid
-    e["desc"] = desc
-    ent[key] = e
-    p.write_text(json.dumps(ent, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
-    print(f"OK: enriched {key} qid={qid} desc_len={len(desc)} source=wikidata_via_wikipedia")
+    _save_cache()
+    if updated:
+        save_json(p, ent)
+    if errors:
+        raise SystemExit("\n".join(errors))
 
 if __name__ == "__main__":
     main()
@@ -26,13 +26,16 @@ def main():
     
     print("Normalizing data...")
     try:
-        normalize_reports_geojson(reports, entities_path)
+        modified = normalize_reports_geojson(reports, entities_path)
     except Exception as e:
         print(f"Error during normalization: {e}")
         sys.exit(1)
-        
-    print("Saving normalized reports...")
-    save_json(reports_path, reports)
+
+    if modified:
+        print(f"Saving normalized reports ({modified} features updated)...")
+        save_json(reports_path, reports)
+    else:
+        print("No changes; skipping save.")
     print("Done! ✅")
     
     # Verification check on first item
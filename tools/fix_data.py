@@ -9,93 +9,269 @@ following fixes:
 * Remove features with invalid coordinates (lat/lon not numeric or outside
   valid ranges).
 * Deduplicate entries: if two features share the same URL or nearly identical
-  coordinates, only the first occurrence is kept. Duplicate entries are
-  dropped.
+  coordinates (within COORD_TOL degrees on both axes), only the first
+  occurrence is kept. Duplicate entries are dropped.
 * Fill missing required properties (status, category, first_seen, last_seen)
   when possible from the entity or raw text (left blank otherwise).
 The script writes the cleaned data back to the original file and prints a
 summary of changes. A backup of the original file is stored in the same
 directory with `.backup` appended to the filename.
+With --ndjson the cleaned features are instead written one per line to
+`<reports>.seq` (first line: the collection's other members) and the reports
+file itself is left untouched.
 Usage:
     python tools/fix_data.py --reports reports.geojson --entities entities.json
 """
-import argparse, json, shutil
+import argparse, json, math, mmap, os
 from pathlib import Path
-from typing import Dict, Tuple, Any
+from typing import Dict, Tuple, Any, BinaryIO, Callable, Iterable, Iterator, List, Optional
+
+try:
+    import ijson
+except ImportError:  # optional: stream features instead of loading the whole file
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # optional: faster decode in load_json
+    orjson = None
 
 def load_json(path: Path) -> dict:
+    if orjson is not None:
+        # Decode straight from a read-only mapping: no second copy of the file in memory
+        with open(path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file: let stdlib json report it
+                mm = None
+            if mm is not None:
+                with mm, memoryview(mm) as view:
+                    try:
+                        return orjson.loads(view)
+                    except orjson.JSONDecodeError:
+                        pass  # e.g. NaN: stdlib json still accepts it
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def save_json(path: Path, data: dict) -> None:
+def iter_reports(path: Path) -> Tuple[dict, Iterator[dict], dict]:
+    """
+    Split a FeatureCollection into (members before "features", feature
+    iterator, members after "features").
+    With ijson the features are parsed one at a time, so memory stays at one
+    feature; members after "features" are then not kept (our writers never
+    put any there), except that a missing "type" is restored up front.
+    Without ijson the whole file is loaded as before.
+    """
+    if ijson is None:
+        reports = load_json(path)
+        head: Dict[str, Any] = {}
+        tail: Dict[str, Any] = {}
+        seen_features = False
+        for k, v in reports.items():
+            if k == "features":
+                seen_features = True
+            else:
+                (tail if seen_features else head)[k] = v
+        return head, iter(reports.get("features", [])), tail
+
+    head = {}
+    with open(path, "rb") as f:
+        key = None
+        builder = None
+        # Top-level members up to "features"; stop reading there
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is not None:
+                if prefix == "" and event in ("map_key", "end_map"):
+                    head[key] = builder.value
+                    builder = None
+                else:
+                    builder.event(event, value)
+                    continue
+            if prefix == "" and event == "map_key":
+                if value == "features":
+                    break
+                key = value
+                builder = ijson.ObjectBuilder()
+            elif prefix == "" and event == "end_map":
+                break
+
+    if "type" not in head:
+        head = {"type": "FeatureCollection", **head}
+
+    def _features() -> Iterator[dict]:
+        with open(path, "rb") as f:
+            yield from ijson.items(f, "features.item", use_float=True)
+
+    return head, _features(), {}
+
+# The writers emit many small pieces per feature; a large buffer coalesces them
+_WRITE_BUFFER = 1024 * 1024
+
+def _dumps(obj: Any, indent: bool) -> bytes:
+    """
+    UTF-8 JSON, indent=2 or compact. Always stdlib json: orjson formats some
+    floats differently (1e-05 -> 0.00001), which would rewrite those values.
+    """
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _indented(obj: Any, pad: bytes) -> bytes:
+    """json.dumps(indent=2) of obj, as it appears nested at the given padding."""
+    return _dumps(obj, True).replace(b"\n", b"\n" + pad)
+
+def _write_replace(path: Path, write: Callable[[BinaryIO], None], backup_path: Optional[Path] = None) -> None:
+    """
+    Run write(f) on `<path>.tmp`, then move it over path; with backup_path the
+    current file is moved there first. Nothing is renamed until the new
+    content is complete: on failure the tmp file is removed and path is left
+    as it was.
+    """
     tmp_path = path.with_suffix(path.suffix + ".tmp")
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write("\\n")
-    shutil.move(tmp_path, path)
+    try:
+        with open(tmp_path, "wb", buffering=_WRITE_BUFFER) as f:
+            write(f)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if backup_path is not None:
+        path.replace(backup_path)
+    os.replace(tmp_path, path)
 
-def fix_reports(reports: dict, entities: Dict[str, Any]) -> Tuple[dict, int, int, int]:
-    features = reports.get("features", [])
-    new_features = []
+def save_reports(path: Path, head: dict, features: Iterable[dict], tail: dict,
+                 backup_path: Optional[Path] = None) -> None:
+    """
+    Write a FeatureCollection feature by feature, byte-identical to
+    json.dump(indent=2) of the assembled dict, without building it in memory.
+    features may be read lazily from path itself: it is only replaced (and
+    moved to backup_path, if given) once every feature has been written.
+    """
+    def write(f: BinaryIO) -> None:
+        f.write(b"{")
+        sep = b"\n"
+        for k, v in head.items():
+            f.write(sep + b"  " + _dumps(k, False) + b": " + _indented(v, b"  "))
+            sep = b",\n"
+        f.write(sep + b'  "features": [')
+        first = True
+        for feat in features:
+            f.write((b"\n    " if first else b",\n    ") + _indented(feat, b"    "))
+            first = False
+        f.write(b"]" if first else b"\n  ]")
+        for k, v in tail.items():
+            f.write(b",\n  " + _dumps(k, False) + b": " + _indented(v, b"  "))
+        f.write(b"\n}\n")
+    _write_replace(path, write, backup_path)
+
+def save_reports_ndjson(path: Path, head: dict, features: Iterable[dict], tail: dict) -> None:
+    """
+    Newline-delimited layout for streaming consumers: the collection's other
+    members as one compact JSON line, then one compact feature per line.
+    """
+    def write(f: BinaryIO) -> None:
+        f.write(_dumps({**head, **tail}, False) + b"\n")
+        for feat in features:
+            f.write(_dumps(feat, False) + b"\n")
+    _write_replace(path, write)
+
+# Near-duplicate tolerance in degrees (~1 m). Points are bucketed on a grid of
+# this size, so a point only needs comparing against its 3x3 neighbourhood.
+COORD_TOL = 1e-5
+# A cell (row, col) is keyed as one int, row * _CELL_ROW + col: cheaper to hash
+# than a tuple, and the neighbourhood becomes fixed offsets. Columns stay
+# within +-18e6 (+-180 deg), far inside half a row, so keys never collide.
+_CELL_ROW = 1 << 26
+_NEIGHBOUR_OFFSETS = tuple(dy * _CELL_ROW + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1))
+
+def fix_features(features: Iterable[dict], entities: Dict[str, Any], counts: Dict[str, int]) -> Iterator[dict]:
+    """
+    Yield the kept, fixed features one by one. counts ("fixed", "removed",
+    "deduped") is updated as the iterator is consumed.
+    """
     seen_urls: set[str] = set()
-    seen_coords: set[Tuple[int, int]] = set()
-    fixed_count = 0
-    removed_count = 0
-    deduped_count = 0
+    seen_coords: Dict[int, List[Tuple[float, float]]] = {}
+    seen_in = seen_coords.get
+    # (display, desc) per entity key, extracted once instead of per feature
+    ent_fields = {
+        k: (v.get("display") or "", v.get("desc") or "")
+        for k, v in entities.items() if v and isinstance(v, dict)
+    }
     for feat in features:
-        props = feat.get("properties", {})
-        key = str(props.get("entity_key") or props.get("sticker_type") or "").strip()
-        ent = entities.get(key)
-        lat = props.get("lat")
-        lon = props.get("lon")
+        props = feat.get("properties") or {}
+        get = props.get
+        lat = get("lat")
+        lon = get("lon")
         if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
-            removed_count += 1
+            counts["removed"] += 1
             continue
         if not (-90 <= lat <= 90 and -180 <= lon <= 180):
-            removed_count += 1
+            counts["removed"] += 1
             continue
-        coord_key = (round(lat, 5), round(lon, 5))
-        url = str(props.get("url") or "").strip()
-        if url in seen_urls:
-            deduped_count += 1
+        # Reports without a URL are not duplicates of each other
+        url = str(get("url") or "").strip()
+        if url and url in seen_urls:
+            counts["deduped"] += 1
             continue
-        if coord_key in seen_coords:
-            deduped_count += 1
+        cell = math.floor(lat / COORD_TOL) * _CELL_ROW + math.floor(lon / COORD_TOL)
+        if any(
+            abs(lat - plat) < COORD_TOL and abs(lon - plon) < COORD_TOL
+            for off in _NEIGHBOUR_OFFSETS
+            for plat, plon in seen_in(cell + off, ())
+        ):
+            counts["deduped"] += 1
             continue
-        seen_urls.add(url)
-        seen_coords.add(coord_key)
-        if ent:
-            if not props.get("entity_display"):
-                props["entity_display"] = ent.get("display") or ""
-                fixed_count += 1
-            if not props.get("entity_desc"):
-                props["entity_desc"] = ent.get("desc") or ""
-                fixed_count += 1
-        if not props.get("category"):
-            props["category"] = props.get("entity_display") or key
-        if not props.get("status"):
+        if url:
+            seen_urls.add(url)
+        seen_coords.setdefault(cell, []).append((lat, lon))
+        key = str(get("entity_key") or get("sticker_type") or "").strip()
+        fields = ent_fields.get(key)
+        if fields:
+            if not get("entity_display"):
+                props["entity_display"] = fields[0]
+                counts["fixed"] += 1
+            if not get("entity_desc"):
+                props["entity_desc"] = fields[1]
+                counts["fixed"] += 1
+        if not get("category"):
+            props["category"] = get("entity_display") or key
+        if not get("status"):
             props["status"] = "present"
-        if not props.get("first_seen"):
-            props["first_seen"] = props.get("last_seen") or ""
-        if not props.get("last_seen"):
-            props["last_seen"] = props.get("first_seen") or ""
-        new_features.append(feat)
+        if not get("first_seen"):
+            props["first_seen"] = get("last_seen") or ""
+        if not get("last_seen"):
+            props["last_seen"] = get("first_seen") or ""
+        yield feat
+
+def fix_reports(reports: dict, entities: Dict[str, Any]) -> Tuple[dict, int, int, int]:
+    counts = {"fixed": 0, "removed": 0, "deduped": 0}
+    new_features: List[dict] = list(fix_features(reports.get("features", []), entities, counts))
     new_reports = reports.copy()
     new_reports["features"] = new_features
-    return new_reports, fixed_count, removed_count, deduped_count
+    return new_reports, counts["fixed"], counts["removed"], counts["deduped"]
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Fix reports GeoJSON file")
     parser.add_argument("--reports", default="reports.geojson")
     parser.add_argument("--entities", default="entities.json")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="write one feature per line to <reports>.seq and leave the reports file untouched")
     args = parser.parse_args()
-    reports = load_json(Path(args.reports))
+    reports_path = Path(args.reports)
     entities = load_json(Path(args.entities))
-    cleaned, fixed_count, removed_count, deduped_count = fix_reports(reports, entities)
-    backup_path = Path(args.reports).with_suffix(Path(args.reports).suffix + ".backup")
-    Path(args.reports).replace(backup_path)
-    save_json(Path(args.reports), cleaned)
-    print(f"Applied fixes: {fixed_count} fields filled, removed {removed_count} entries, deduped {deduped_count} entries")
+    counts = {"fixed": 0, "removed": 0, "deduped": 0}
+    if args.ndjson:
+        seq_path = reports_path.with_suffix(reports_path.suffix + ".seq")
+        head, features, tail = iter_reports(reports_path)
+        save_reports_ndjson(seq_path, head, fix_features(features, entities, counts), tail)
+        print(f"Applied fixes: {counts['fixed']} fields filled, removed {counts['removed']} entries, deduped {counts['deduped']} entries")
+        print(f"Wrote newline-delimited features to: {seq_path}")
+        return
+    # Features stream from the original into a tmp file, one at a time; the
+    # original only moves to the backup once the cleaned file is complete
+    backup_path = reports_path.with_suffix(reports_path.suffix + ".backup")
+    head, features, tail = iter_reports(reports_path)
+    save_reports(reports_path, head, fix_features(features, entities, counts), tail, backup_path)
+    print(f"Applied fixes: {counts['fixed']} fields filled, removed {counts['removed']} entries, deduped {counts['deduped']} entries")
     print(f"Original file backed up as: {backup_path}")
 
 if __name__ == "__main__":
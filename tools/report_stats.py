@@ -3,15 +3,168 @@ import re
 import pathlib
 import json
 import os
+from collections import deque
+from operator import itemgetter
 
-def read_lines(path: pathlib.Path):
+# Counted bot line prefixes; the startswith tuple rejects other lines in one C call
+BOT_PREFIXES = ("START Version", "CHECKS |", "SUMMARY ")
+
+_TZ_CACHE = {}
+
+def offset_tz(off: str) -> dt.timezone:
+    """
+    "+01:00" / "+0100" -> timezone, memoized per distinct offset text.
+    Raises ValueError for offsets fromisoformat would reject.
+    """
+    tz = _TZ_CACHE.get(off)
+    if tz is None:
+        sign = -1 if off[0] == "-" else 1
+        tz = _TZ_CACHE[off] = dt.timezone(sign * dt.timedelta(hours=int(off[1:3]), minutes=int(off[-2:])))
+    return tz
+
+def line_ts(day: str, clock: str, off: str) -> dt.datetime:
+    """Aware datetime from "YYYY-MM-DD", "HH:MM:SS" and offset text, without an ISO round trip."""
+    return dt.datetime(int(day[:4]), int(day[5:7]), int(day[8:10]),
+                       int(clock[:2]), int(clock[3:5]), int(clock[6:8]), tzinfo=offset_tz(off))
+
+def parsed_before(rx: re.Pattern, line: str, when: dt.datetime) -> bool:
+    """True if line is a log line rx parses and its timestamp is before when."""
+    m = rx.match(line)
+    if not m:
+        return False
+    try:
+        return line_ts(*m.group(1, 2, 3)) < when
+    except ValueError:
+        return False
+
+def cut_wall_clock(cut: dt.datetime, fmt: str):
+    """
+    Return offset text ("+01:00" / "+0100") -> cut as wall-clock text in that
+    offset, memoized. A canonical log line whose own wall-clock text sorts
+    before it is older than cut, so it can be skipped without the regex and
+    datetime parse. Unparsable offsets map to "", which never skips.
+    """
+    cache = {}
+    def wall(off: str) -> str:
+        w = cache.get(off)
+        if w is None:
+            try:
+                w = cut.astimezone(offset_tz(off)).strftime(fmt)
+            except (ValueError, IndexError):
+                w = ""
+            cache[off] = w
+        return w
+    return wall
+
+def _lines_reversed(f, chunk_size: int):
+    """
+    Yield the lines of binary file f last first, as splitlines() of its
+    decoded text gives them, reading back from EOF in chunks.
+    """
+    pos = f.seek(0, os.SEEK_END)
+    carry = b""
+    after = ""  # what followed a segment: nothing at EOF, "\n" otherwise
+
+    def split(raw: bytes):
+        # UTF-8 never has a "\n" byte inside a sequence, so segments decode alone
+        return reversed((raw.decode("utf-8", errors="ignore") + after).splitlines())
+
+    while pos > 0:
+        step = min(chunk_size, pos)
+        pos -= step
+        f.seek(pos)
+        parts = (f.read(step) + carry).split(b"\n")
+        carry = parts[0]  # may continue in the chunk before
+        for raw in reversed(parts[1:]):
+            yield from split(raw)
+            after = "\n"
+    yield from split(carry)
+
+def read_recent_lines(path: pathlib.Path, is_old, chunk_size: int = 1 << 20):
+    """
+    Lines of path as read_text().splitlines() gives them, but only those after
+    the last line is_old flags: the file is read backwards from EOF in chunks
+    and reading stops there. Logs are append-ordered, so on a long log only
+    the tail is read. is_old must only flag lines it is sure about: a wrong
+    hit drops everything before it.
+    """
     if not path.exists():
         return []
-    return path.read_text(encoding="utf-8", errors="ignore").splitlines()
+    out = []
+    with open(path, "rb") as f:
+        for line in _lines_reversed(f, chunk_size):
+            if is_old(line):
+                break
+            out.append(line)
+    out.reverse()
+    return out
+
+AUDIT_FIELDS = ("targets", "deleted_ok", "deleted_fail", "mode")
+_audit_values = itemgetter(*AUDIT_FIELDS)
+# Extracted audit fields per file name, reused while the file's mtime and size
+# are unchanged, so repeated runs don't re-parse the same audits.
+AUDIT_CACHE_NAME = ".audit_stats.cache.json"
+
+def audit_fields(p: pathlib.Path) -> dict:
+    try:
+        js = json.loads(p.read_text(encoding="utf-8", errors="ignore")) or {}
+        try:
+            targets, deleted_ok, deleted_fail, mode = _audit_values(js)
+        except KeyError:  # older audits lack some fields
+            targets, deleted_ok, deleted_fail, mode = map(js.get, AUDIT_FIELDS)
+        return {
+            "targets": len(targets) if isinstance(targets, list) else None,
+            "deleted_ok": deleted_ok,
+            "deleted_fail": deleted_fail,
+            "mode": mode,
+        }
+    except Exception:
+        return dict.fromkeys(AUDIT_FIELDS)
+
+def latest_audits(aud_dir: pathlib.Path, n: int = 6) -> list:
+    """Fields of the n most recently modified deleted_*json audits, newest first."""
+    cache_path = aud_dir / AUDIT_CACHE_NAME
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        if not isinstance(cache, dict):
+            cache = {}
+    except Exception:
+        cache = {}
+
+    stats = []
+    for p in aud_dir.glob("deleted_*json"):
+        try:
+            stats.append((p, p.stat()))
+        except OSError:
+            continue  # removed since the glob
+    stats.sort(key=lambda ps: ps[1].st_mtime, reverse=True)
+
+    audits = []
+    new_cache = {}
+    for p, st in stats[:n]:
+        hit = cache.get(p.name)
+        if isinstance(hit, dict) and hit.get("mtime_ns") == st.st_mtime_ns and hit.get("size") == st.st_size:
+            fields = {k: hit.get(k) for k in AUDIT_FIELDS}
+        else:
+            fields = audit_fields(p)
+        new_cache[p.name] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, **fields}
+        audits.append({"name": p.name, **fields})
+
+    if new_cache != cache:
+        try:
+            tmp = cache_path.with_name(cache_path.name + ".tmp")
+            tmp.write_text(json.dumps(new_cache), encoding="utf-8")
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass  # cache only; the report is still correct
+    return audits
 
 def main():
     now = dt.datetime.now().astimezone()
     cut = now - dt.timedelta(minutes=60)
+    # Logs are read back from EOF until a line older than this; the slack
+    # covers lines interleaved slightly out of order by overlapping runs.
+    stop = cut - dt.timedelta(minutes=10)
     
     # Paths are relative to CWD (project root when run via ox)
     bot_launchd_log = pathlib.Path("bot.launchd.log")
@@ -20,15 +173,24 @@ def main():
 
     # ---------- BOT (launchd log) ----------
     rx_bot = re.compile(r"^(\d{4}-\d{2}-\d{2})\s*//\s*(\d{2}:\d{2}:\d{2})([+-]\d{2}:\d{2})\s*-\s*(.*)$")
-    bot = {"reply_ok":0,"reply_fail":0,"reply_err":0,"rate":0,"starts":0,"checks":0,"summary":0}
-    bot_lines=[]
+    # Plain int locals in the loop; packed into the dict for printing afterwards
+    reply_ok = reply_fail = reply_err = rate = starts = checks = summary = 0
+    bot_lines = deque(maxlen=25)  # only the last 25 relevant lines are printed
+    bot_append = bot_lines.append
+    bot_cut = cut_wall_clock(cut, "%Y-%m-%d // %H:%M:%S")
+    bot_stop = cut_wall_clock(stop, "%Y-%m-%d // %H:%M:%S")
+    bot_is_old = lambda line: (line[10:14] == " // " and line[:22] < bot_stop(line[22:28])
+                               and parsed_before(rx_bot, line, stop))
     
-    for line in read_lines(bot_launchd_log):
+    for line in read_recent_lines(bot_launchd_log, bot_is_old):
+        # "YYYY-MM-DD // HH:MM:SS+01:00 - ...": cheap string prefilter on old lines
+        if line[10:14] == " // " and line[:22] < bot_cut(line[22:28]):
+            continue
         m = rx_bot.match(line)
         if not m:
             continue
         try:
-            ts = dt.datetime.fromisoformat(f"{m.group(1)}T{m.group(2)}{m.group(3)}")
+            ts = line_ts(*m.group(1, 2, 3))
         except ValueError:
             continue
             
@@ -36,27 +198,42 @@ def main():
             continue
         
         rest = m.group(4)
-        if rest.startswith("START Version"): bot["starts"] += 1; bot_lines.append(line)
-        elif rest.startswith("CHECKS |"): bot["checks"] += 1; bot_lines.append(line)
-        elif rest.startswith("SUMMARY "): bot["summary"] += 1; bot_lines.append(line)
+        matched = False
+        if rest.startswith(BOT_PREFIXES):
+            if rest.startswith("START Version"): starts += 1
+            elif rest.startswith("CHECKS |"): checks += 1
+            else: summary += 1
+            matched = True
         
-        if "reply OK in_reply_to=" in rest: bot["reply_ok"] += 1; bot_lines.append(line)
-        elif "reply FAILED in_reply_to=" in rest: bot["reply_fail"] += 1; bot_lines.append(line)
-        elif "reply ERROR in_reply_to=" in rest: bot["reply_err"] += 1; bot_lines.append(line)
-        elif "🤖 RATE | window=" in rest: bot["rate"] += 1; bot_lines.append(line)
+        # Reply markers in this order (all share the in_reply_to= tail), else the rate line
+        reply = " in_reply_to=" in rest
+        if reply and "reply OK in_reply_to=" in rest: reply_ok += 1; matched = True
+        elif reply and "reply FAILED in_reply_to=" in rest: reply_fail += 1; matched = True
+        elif reply and "reply ERROR in_reply_to=" in rest: reply_err += 1; matched = True
+        elif "🤖 RATE | window=" in rest: rate += 1; matched = True
+        if matched: bot_append(line)
+    bot = {"reply_ok": reply_ok, "reply_fail": reply_fail, "reply_err": reply_err, "rate": rate,
+           "starts": starts, "checks": checks, "summary": summary}
 
     # ---------- DELETE RUNNER (support/support.log) ----------
     rx_sup = re.compile(r"^(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2})([+-]\d{4})\s+(.*)$")
-    sup = {"del_ok":0,"gone_ok":0,"del_fail":0,"rate_429":0,"batches":0}
-    sup_lines=[]
+    del_ok = gone_ok = del_fail = rate_429 = batches = 0
+    sup_lines = deque(maxlen=40)  # only the last 40 relevant lines are printed
+    sup_append = sup_lines.append
+    sup_cut = cut_wall_clock(cut, "%Y-%m-%d %H:%M:%S")
+    sup_stop = cut_wall_clock(stop, "%Y-%m-%d %H:%M:%S")
+    sup_is_old = lambda line: (line[10:11] == " " and line[:19] < sup_stop(line[19:24])
+                               and parsed_before(rx_sup, line, stop))
     
-    for line in read_lines(support_log):
+    for line in read_recent_lines(support_log, sup_is_old):
+        # "YYYY-MM-DD HH:MM:SS+0100 ...": same prefilter
+        if line[10:11] == " " and line[:19] < sup_cut(line[19:24]):
+            continue
         m = rx_sup.match(line)
         if not m:
             continue
         try:
-            tz = m.group(3); tz = tz[:3] + ":" + tz[3:]  # +0100 -> +01:00
-            ts = dt.datetime.fromisoformat(f"{m.group(1)}T{m.group(2)}{tz}")
+            ts = line_ts(*m.group(1, 2, 3))
         except ValueError:
             continue
 
@@ -64,28 +241,17 @@ def main():
             continue
         
         rest = m.group(4)
-        if rest.startswith("BATCH "): sup["batches"] += 1; sup_lines.append(line)
-        if "DEL OK" in rest: sup["del_ok"] += 1; sup_lines.append(line)
-        if "GONE OK" in rest: sup["gone_ok"] += 1; sup_lines.append(line)
-        if ("DEL FAIL" in rest) or ("WAIT/FAIL" in rest) or ("FETCH FAIL" in rest): sup["del_fail"] += 1; sup_lines.append(line)
-        if (" 429" in rest) or ("rate_limited" in rest) or ("Too many requests" in rest): sup["rate_429"] += 1; sup_lines.append(line)
+        matched = False
+        if rest.startswith("BATCH "): batches += 1; matched = True
+        if "DEL OK" in rest: del_ok += 1; matched = True
+        if "GONE OK" in rest: gone_ok += 1; matched = True
+        if "FAIL" in rest and (("DEL FAIL" in rest) or ("WAIT/FAIL" in rest) or ("FETCH FAIL" in rest)): del_fail += 1; matched = True
+        if (" 429" in rest) or ("rate_limited" in rest) or ("Too many requests" in rest): rate_429 += 1; matched = True
+        if matched: sup_append(line)
+    sup = {"del_ok": del_ok, "gone_ok": gone_ok, "del_fail": del_fail, "rate_429": rate_429, "batches": batches}
 
     # ---------- audits overview ----------
-    audits = []
-    if aud_dir.exists():
-        for p in sorted(aud_dir.glob("deleted_*json"), key=lambda x: x.stat().st_mtime, reverse=True)[:6]:
-            try:
-                js = json.loads(p.read_text(encoding="utf-8", errors="ignore")) or {}
-                targets = js.get("targets")
-                audits.append({
-                    "name": p.name,
-                    "targets": len(targets) if isinstance(targets, list) else None,
-                    "deleted_ok": js.get("deleted_ok"),
-                    "deleted_fail": js.get("deleted_fail"),
-                    "mode": js.get("mode"),
-                })
-            except Exception:
-                audits.append({"name": p.name, "targets": None, "deleted_ok": None, "deleted_fail": None, "mode": None})
+    audits = latest_audits(aud_dir) if aud_dir.exists() else []
 
     print(f"🤖 CHECK_BOT | window=60m | {cut.strftime('%Y-%m-%d %H:%M:%S%z')} .. {now.strftime('%Y-%m-%d %H:%M:%S%z')}")
     print(f"BOT: starts={bot['starts']} checks={bot['checks']} summary_lines={bot['summary']} | replies ok={bot['reply_ok']} fail={bot['reply_fail']} err={bot['reply_err']} | rate_lines={bot['rate']}")
@@ -94,9 +260,9 @@ def main():
     for a in audits:
         print(f"- {a['name']} | targets={a['targets']} | deleted_ok={a['deleted_ok']} | deleted_fail={a['deleted_fail']} | mode={a['mode']}")
     print("--- BOT last 25 relevant ---")
-    for l in bot_lines[-25:]: print(l)
+    for l in bot_lines: print(l)
     print("--- DELETE last 40 relevant ---")
-    for l in sup_lines[-40:]: print(l)
+    for l in sup_lines: print(l)
 
 if __name__ == "__main__":
     main()